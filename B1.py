@@ -1,99 +1,346 @@
 import cv2
 import numpy as np
 
-img = cv2.imread('sEuidy5yWe9A.png')
-original = img.copy()
-gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-
-b, g, r = cv2.split(img)
-kernel = np.ones((5,5), np.uint8)
-
-edges_channels = {}
-for name, ch in [('b', b), ('g', g), ('r', r)]:
-    ch_blur = cv2.GaussianBlur(ch, (9, 9), 1.5)
-    ch_blur = cv2.medianBlur(ch_blur, 5)
-    edges_ch = cv2.Canny(ch_blur, 50, 150)
-    edges_ch = cv2.morphologyEx(edges_ch, cv2.MORPH_CLOSE, kernel, iterations=2)
-    edges_channels[name] = edges_ch
-edges = cv2.bitwise_or(edges_channels['r'], cv2.bitwise_or(edges_channels['g'], edges_channels['b']))
-
-blur_for_circles = cv2.GaussianBlur(gray, (11, 11), 2)
-blur_for_circles = cv2.medianBlur(blur_for_circles, 5)
-
-circles = cv2.HoughCircles(
-    blur_for_circles,
-    cv2.HOUGH_GRADIENT,
-    dp=1,                
-    minDist=50,          
-    param1=50,           
-    param2=30,           
-    minRadius=20,        
-    maxRadius=400        
-)
-
-detected_circles = []
-if circles is not None:
-    circles = np.uint16(np.around(circles))
-
-    for i, circle in enumerate(circles[0, :]):
-        cx, cy, radius = circle
-        cv2.circle(img, (cx, cy), radius, (255, 0, 255), 3)
-        cv2.circle(img, (cx, cy), 2, (0, 0, 255), 3)
-        x = cx - radius
-        y = cy - radius
-        
-        detected_circles.append({'center': (cx, cy), 'radius': radius})
-
-
-contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-contours = [c for c in contours if cv2.contourArea(c) > 500]
-
-objects = []
-for cnt in contours:
-    peri = cv2.arcLength(cnt, True)
-    approx = cv2.approxPolyDP(cnt, 0.02 * peri, True)
-    x, y, w, h = cv2.boundingRect(approx)
-    shape = "Tidak diketahui"
-
-    if len(approx) == 3:
-        shape = "Segitiga"
-    elif len(approx) == 4:
-        ratio = w / float(h)
-        shape = "Persegi" if 0.95 <= ratio <= 1.05 else "Persegi Panjang"
-
-    objects.append({'shape': shape, 'bounding_box': (x, y, w, h), "center": (x + w//2, y + h//2)})
-
-for obj in objects:
-    if obj['shape'] == "Persegi Panjang":
-        x, y, w, h = obj['bounding_box']
-        cx, cy = obj['center']
-        
-        has_circle = any(x<c["center"][0]<x+w and y<c["center"][1]<y+h for c in detected_circles)
-
-        box_color = (0, 255, 0)  
-        cv2.rectangle(img, (x, y), (x+w, y+h), box_color, 3)
-        
-        if has_circle:
-            cv2.putText(img, "DROPZONE", (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.7, box_color, 2)
-            cv2.drawMarker(img, (cx, cy), (0, 0, 0), cv2.MARKER_CROSS, 20, 3)
+from stage_trace import stage, traced
+
+IMAGE_PATH = 'sEuidy5yWe9A.png'
+
+DROPZONE = "DROPZONE"
+LANDZONE = "LANDZONE"
+BUCKET = "BUCKET"
+
+
+class DetectionParams:
+    """Parameter pipeline deteksi; default sama dengan nilai asli skrip B1"""
+
+    __slots__ = ('channel_blur_ksize', 'channel_blur_sigma', 'median_ksize',
+                 'canny_low', 'canny_high', 'close_kernel_size', 'close_iterations',
+                 'circle_blur_ksize', 'circle_blur_sigma',
+                 'hough_dp', 'hough_min_dist', 'hough_param1', 'hough_param2',
+                 'min_radius', 'max_radius', 'min_contour_area', 'approx_epsilon',
+                 'square_ratio_min', 'square_ratio_max')
+
+    def __init__(self, **overrides):
+        self.channel_blur_ksize = 9
+        self.channel_blur_sigma = 1.5
+        self.median_ksize = 5
+        self.canny_low = 50
+        self.canny_high = 150
+        self.close_kernel_size = 5
+        self.close_iterations = 2
+        self.circle_blur_ksize = 11
+        self.circle_blur_sigma = 2
+        self.hough_dp = 1
+        self.hough_min_dist = 50
+        self.hough_param1 = 50
+        self.hough_param2 = 30
+        self.min_radius = 20
+        self.max_radius = 400
+        self.min_contour_area = 500
+        self.approx_epsilon = 0.02
+        self.square_ratio_min = 0.95
+        self.square_ratio_max = 1.05
+        for name, value in overrides.items():
+            setattr(self, name, value)
+
+
+class Circle:
+    __slots__ = ('center', 'radius')
+
+    def __init__(self, center, radius):
+        self.center = center
+        self.radius = radius
+
+    def to_dict(self):
+        return {'center': list(self.center), 'radius': self.radius}
+
+
+class Shape:
+    """Kontur hasil approxPolyDP: Segitiga, Persegi, Persegi Panjang atau Tidak diketahui"""
+
+    __slots__ = ('shape', 'bounding_box', 'center')
+
+    def __init__(self, shape, bounding_box, center):
+        self.shape = shape
+        self.bounding_box = bounding_box
+        self.center = center
+
+    def to_dict(self):
+        return {'shape': self.shape, 'bounding_box': list(self.bounding_box),
+                'center': list(self.center)}
+
+
+class Zone:
+    """Zona terklasifikasi: DROPZONE/LANDZONE (persegi panjang) atau BUCKET (lingkaran)"""
+
+    __slots__ = ('label', 'bounding_box', 'center', 'radius')
+
+    def __init__(self, label, bounding_box, center, radius=None):
+        self.label = label
+        self.bounding_box = bounding_box
+        self.center = center
+        self.radius = radius
+
+    def to_dict(self):
+        result = {'label': self.label, 'bounding_box': list(self.bounding_box),
+                  'center': list(self.center)}
+        if self.radius is not None:
+            result['radius'] = self.radius
+        return result
+
+
+class Detections:
+    __slots__ = ('circles', 'shapes', 'zones')
+
+    def __init__(self, circles, shapes, zones):
+        self.circles = circles
+        self.shapes = shapes
+        self.zones = zones
+
+    def to_dict(self):
+        return {'circles': [c.to_dict() for c in self.circles],
+                'shapes': [s.to_dict() for s in self.shapes],
+                'zones': [z.to_dict() for z in self.zones]}
+
+
+@traced('B1.find_edges')
+def find_edges(img, params):
+    b, g, r = cv2.split(img)
+    kernel = np.ones((params.close_kernel_size, params.close_kernel_size), np.uint8)
+    ksize = (params.channel_blur_ksize, params.channel_blur_ksize)
+
+    edges_channels = {}
+    for name, ch in [('b', b), ('g', g), ('r', r)]:
+        with stage('B1.gaussian_blur', ch.nbytes):
+            ch_blur = cv2.GaussianBlur(ch, ksize, params.channel_blur_sigma)
+        with stage('B1.median_blur', ch.nbytes):
+            ch_blur = cv2.medianBlur(ch_blur, params.median_ksize)
+        with stage('B1.canny', ch.nbytes):
+            edges_ch = cv2.Canny(ch_blur, params.canny_low, params.canny_high)
+        with stage('B1.morphology', ch.nbytes):
+            edges_ch = cv2.morphologyEx(edges_ch, cv2.MORPH_CLOSE, kernel,
+                                        iterations=params.close_iterations)
+        edges_channels[name] = edges_ch
+    with stage('B1.bitwise_or', 2 * b.nbytes):
+        return cv2.bitwise_or(edges_channels['r'], cv2.bitwise_or(edges_channels['g'], edges_channels['b']))
+
+
+@traced('B1.blur_for_circles')
+def blur_for_circles(img, params):
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    ksize = (params.circle_blur_ksize, params.circle_blur_ksize)
+    blurred = cv2.GaussianBlur(gray, ksize, params.circle_blur_sigma)
+    return cv2.medianBlur(blurred, params.median_ksize)
+
+
+@traced('B1.hough_circles')
+def find_circles(blurred, params):
+    circles = cv2.HoughCircles(
+        blurred,
+        cv2.HOUGH_GRADIENT,
+        dp=params.hough_dp,
+        minDist=params.hough_min_dist,
+        param1=params.hough_param1,
+        param2=params.hough_param2,
+        minRadius=params.min_radius,
+        maxRadius=params.max_radius
+    )
+    if circles is None:
+        return []
+    circles = np.around(circles[0, :]).astype(int)
+    return [Circle((int(cx), int(cy)), int(radius)) for cx, cy, radius in circles]
+
+
+@traced('B1.find_shapes')
+def find_shapes(edges, params):
+    with stage('B1.find_contours', edges.nbytes):
+        contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    with stage('B1.contour_area'):
+        contours = [c for c in contours if cv2.contourArea(c) > params.min_contour_area]
+
+    shapes = []
+    for cnt in contours:
+        with stage('B1.approx_poly', cnt.nbytes):
+            peri = cv2.arcLength(cnt, True)
+            approx = cv2.approxPolyDP(cnt, params.approx_epsilon * peri, True)
+        x, y, w, h = cv2.boundingRect(approx)
+        shape = "Tidak diketahui"
+
+        if len(approx) == 3:
+            shape = "Segitiga"
+        elif len(approx) == 4:
+            ratio = w / float(h)
+            is_square = params.square_ratio_min <= ratio <= params.square_ratio_max
+            shape = "Persegi" if is_square else "Persegi Panjang"
+
+        shapes.append(Shape(shape, (x, y, w, h), (x + w//2, y + h//2)))
+    return shapes
+
+
+def box_iou(a, b):
+    """
+    Intersection over union dua bounding box (x, y, w, h)
+
+    >>> box_iou((0, 0, 10, 10), (5, 0, 10, 10))
+    0.3333333333333333
+    >>> box_iou((0, 0, 10, 10), (20, 20, 5, 5))
+    0.0
+    """
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    iw = max(min(ax + aw, bx + bw) - max(ax, bx), 0)
+    ih = max(min(ay + ah, by + bh) - max(ay, by), 0)
+    inter = iw * ih
+    union = aw * ah + bw * bh - inter
+    return inter / union if union else 0.0
+
+
+def containment_matrix(rects, circles):
+    """
+    Matriks bool (rect x lingkaran): True jika pusat lingkaran berada di
+    dalam bounding box rect (batas tidak termasuk), dihitung sekaligus.
+
+    >>> rects = [Shape("Persegi Panjang", (0, 0, 10, 10), (5, 5))]
+    >>> circles = [Circle((5, 5), 3), Circle((10, 5), 3), Circle((20, 20), 3)]
+    >>> containment_matrix(rects, circles).tolist()
+    [[True, False, False]]
+    """
+    boxes = np.array([r.bounding_box for r in rects], dtype=np.int64).reshape(-1, 4)
+    centers = np.array([c.center for c in circles], dtype=np.int64).reshape(-1, 2)
+    x, y = boxes[:, 0:1], boxes[:, 1:2]
+    right, bottom = x + boxes[:, 2:3], y + boxes[:, 3:4]
+    cx, cy = centers[:, 0], centers[:, 1]
+    return (x < cx) & (cx < right) & (y < cy) & (cy < bottom)
+
+
+def containing_rects(rects, circles):
+    """
+    Indeks rect pertama yang memuat tiap lingkaran, -1 jika tidak ada
+
+    >>> rects = [Shape("Persegi Panjang", (0, 0, 10, 10), (5, 5)),
+    ...          Shape("Persegi Panjang", (4, 4, 10, 10), (9, 9))]
+    >>> containing_rects(rects, [Circle((5, 5), 3), Circle((12, 12), 3), Circle((0, 5), 3)]).tolist()
+    [0, 1, -1]
+    """
+    if not rects:
+        return np.full(len(circles), -1, dtype=np.int64)
+    inside = containment_matrix(rects, circles)
+    return np.where(inside.any(axis=0), inside.argmax(axis=0), -1)
+
+
+@traced('B1.classify_zones')
+def classify_zones(shapes, circles):
+    """
+    Persegi panjang berisi pusat lingkaran -> DROPZONE, tanpa lingkaran ->
+    LANDZONE; lingkaran di luar semua persegi panjang -> BUCKET
+
+    >>> shapes = [Shape("Persegi Panjang", (0, 0, 100, 50), (50, 25)),
+    ...           Shape("Persegi Panjang", (200, 0, 100, 50), (250, 25)),
+    ...           Shape("Persegi", (400, 0, 50, 50), (425, 25))]
+    >>> circles = [Circle((50, 25), 20), Circle((425, 25), 10)]
+    >>> [(z.label, z.bounding_box) for z in classify_zones(shapes, circles)]
+    [('DROPZONE', (0, 0, 100, 50)), ('LANDZONE', (200, 0, 100, 50)), ('BUCKET', (415, 15, 20, 20))]
+
+    Acak: sama dengan loop any() versi sebelumnya, termasuk pusat tepat di batas
+
+    >>> def inside(rect, circle):
+    ...     x, y, w, h = rect.bounding_box
+    ...     cx, cy = circle.center
+    ...     return x < cx < x + w and y < cy < y + h
+    >>> def loop_zones(shapes, circles):
+    ...     rects = [s for s in shapes if s.shape == "Persegi Panjang"]
+    ...     labels = [(DROPZONE if any(inside(r, c) for c in circles) else LANDZONE, r.bounding_box)
+    ...               for r in rects]
+    ...     return labels + [(BUCKET, c.center) for c in circles
+    ...                      if not any(inside(r, c) for r in rects)]
+    >>> rng = np.random.default_rng(13)
+    >>> mismatches = 0
+    >>> for _ in range(300):
+    ...     shapes = [Shape(rng.choice(["Persegi Panjang", "Persegi", "Segitiga"]),
+    ...                     tuple(int(v) for v in rng.integers(0, 20, 4)), (0, 0))
+    ...               for _ in range(rng.integers(0, 6))]
+    ...     circles = [Circle(tuple(int(v) for v in rng.integers(0, 40, 2)), 3)
+    ...                for _ in range(rng.integers(0, 6))]
+    ...     zones = classify_zones(shapes, circles)
+    ...     got = [(z.label, z.center if z.label == BUCKET else z.bounding_box) for z in zones]
+    ...     mismatches += got != loop_zones(shapes, circles)
+    >>> mismatches
+    0
+    """
+    rects = [s for s in shapes if s.shape == "Persegi Panjang"]
+    inside = containment_matrix(rects, circles)
+    has_circle = inside.any(axis=1)
+    contained = inside.any(axis=0)
+
+    zones = []
+    for rect, occupied in zip(rects, has_circle):
+        zones.append(Zone(DROPZONE if occupied else LANDZONE, rect.bounding_box, rect.center))
+
+    for c, in_rect in zip(circles, contained):
+        if not in_rect:
+            cx, cy = c.center
+            bbox = (cx - c.radius, cy - c.radius, 2 * c.radius, 2 * c.radius)
+            zones.append(Zone(BUCKET, bbox, c.center, c.radius))
+    return zones
+
+
+@traced('B1.detect')
+def detect(frame, params=None, engine=None):
+    """
+    Mendeteksi lingkaran, bentuk dan zona pada frame BGR tanpa menggambar,
+    tanpa GUI dan tanpa menulis file. engine (edge_engine.EdgeEngine)
+    opsional untuk tahap edge/blur yang paralel dengan buffer dipakai ulang;
+    jika engine dipakai, semua tahap memakai engine.params.
+    """
+    if engine is not None:
+        if params is not None and params is not engine.params:
+            raise ValueError("params harus sama dengan engine.params (atau None) jika engine dipakai")
+        params = engine.params
+    params = params or DetectionParams()
+    if engine is not None:
+        edges, blurred = engine.process(frame)
+    else:
+        edges, blurred = find_edges(frame, params), blur_for_circles(frame, params)
+    circles = find_circles(blurred, params)
+    shapes = find_shapes(edges, params)
+    return Detections(circles, shapes, classify_zones(shapes, circles))
+
+
+@traced('B1.draw_detections')
+def draw_detections(img, detections):
+    """Menggambar hasil deteksi di atas img (in-place) dan mengembalikannya"""
+    for c in detections.circles:
+        cv2.circle(img, c.center, c.radius, (255, 0, 255), 3)
+        cv2.circle(img, c.center, 2, (0, 0, 255), 3)
+
+    box_color = (0, 255, 0)
+    for zone in detections.zones:
+        x, y, w, h = zone.bounding_box
+        cv2.rectangle(img, (x, y), (x + w, y + h), box_color, 3)
+        if zone.label == BUCKET:
+            cv2.drawMarker(img, zone.center, (0, 255, 255), cv2.MARKER_CROSS, 20, 3)
+            cv2.putText(img, zone.label, (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.7, box_color, 2)
         else:
-            cv2.putText(img, "LANDZONE", (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.7, box_color, 2)
-            cv2.drawMarker(img, (cx, cy), (0, 255, 0), cv2.MARKER_CROSS, 20, 3)
-
-for c in detected_circles:
-    cx, cy = c['center']
-    radius = c['radius']
-    inside_rect = any (x < cx < x + w and y < cy < y + h for obj in objects if obj['shape'] == "Persegi Panjang" for x, y, w, h in [obj['bounding_box']])
-    if not inside_rect:
-        box_color = (0, 255, 0)
-        
-        x = cx - radius
-        y = cy - radius
-        cv2.rectangle(img, (x, y), (x + radius*2, y + radius*2), box_color, 3)
-        cv2.drawMarker(img, (cx, cy), (0, 255, 255), cv2.MARKER_CROSS, 20, 3)        
-        cv2.putText(img, "BUCKET", (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.7, box_color, 2)
-
-cv2.imshow("Detected Shapes + Circles", img)
-cv2.imwrite("detected.png", img)
-cv2.waitKey(0)
-cv2.destroyAllWindows()
\ No newline at end of file
+            cv2.putText(img, zone.label, (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.7, box_color, 2)
+            marker_color = (0, 0, 0) if zone.label == DROPZONE else (0, 255, 0)
+            cv2.drawMarker(img, zone.center, marker_color, cv2.MARKER_CROSS, 20, 3)
+    return img
+
+
+def detect_and_draw(img, params=None, engine=None):
+    detections = detect(img, params, engine)
+    return draw_detections(img, detections), detections
+
+
+def main():
+    img = cv2.imread(IMAGE_PATH)
+    img, detections = detect_and_draw(img)
+
+    cv2.imshow("Detected Shapes + Circles", img)
+    cv2.imwrite("detected.png", img)
+    cv2.waitKey(0)
+    cv2.destroyAllWindows()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,89 @@
+import argparse
 import math
+import time
+
+import numpy as np
+
+# Kode status hasil perhitungan (pengganti teks status)
+STATUS_TERLAMBAT = 0   # Pesawat sudah melewati titik drop
+STATUS_JATUHKAN = 1    # Titik drop tercapai dalam < 1 detik
+STATUS_TUNGGU = 2      # Belum waktunya, terus terbang
+STATUS_INVALID = 3     # Input tidak valid (ketinggian < 0, g <= 0, NaN / inf)
+
+STATUS_TEKS = {
+    STATUS_TERLAMBAT: "TERLAMBAT! Pesawat sudah melewati titik drop",
+    STATUS_JATUHKAN: "JATUHKAN SEKARANG!",
+    STATUS_TUNGGU: "Belum waktunya, terus terbang",
+    STATUS_INVALID: "INPUT TIDAK VALID! Periksa kecepatan, ketinggian dan g",
+}
+
+HASIL_DTYPE = np.dtype([
+    ('jarak_drop', np.float64),
+    ('waktu_jatuh', np.float64),
+    ('jarak_horizontal_paket', np.float64),
+    ('status', np.int8),
+])
+
+
+def hitung_jarak_penjatuhan_batch(kecepatan_pesawat, ketinggian_pesawat, posisi_pesawat_x,
+                                  posisi_target_x, g=9.8):
+    """
+    Versi vektor dari hitung_jarak_penjatuhan untuk grid / sampel Monte Carlo.
+
+    Parameters:
+    -----------
+    kecepatan_pesawat, ketinggian_pesawat, posisi_pesawat_x, posisi_target_x, g :
+        float atau array NumPy; semua di-broadcast bersama
+        (mis. kecepatan[:, None, None], ketinggian[None, :, None], ...)
+
+    Returns:
+    --------
+    ndarray terstruktur (HASIL_DTYPE) dengan bentuk hasil broadcast:
+        jarak_drop, waktu_jatuh, jarak_horizontal_paket (float64) dan
+        status (int8: STATUS_TERLAMBAT / STATUS_JATUHKAN / STATUS_TUNGGU /
+        STATUS_INVALID).
+        Input tidak valid (ketinggian negatif, g <= 0, NaN / inf) menghasilkan
+        field NaN / inf dan status STATUS_INVALID (bukan exception).
+
+    >>> hasil = hitung_jarak_penjatuhan_batch(np.array([50.0, 100.0, 80.0]),
+    ...                                       np.array([500.0, 1000.0, 200.0]),
+    ...                                       np.array([0.0, 500.0, 1000.0]),
+    ...                                       np.array([600.0, 2000.0, 800.0]))
+    >>> hasil['status'].tolist()
+    [2, 1, 0]
+    >>> [round(float(v), 3) for v in hasil['waktu_jatuh']]
+    [10.102, 14.286, 6.389]
+    >>> hitung_jarak_penjatuhan_batch(50.0, np.array([-10.0, np.nan, 500.0, 500.0]), 0.0, 600.0,
+    ...                               np.array([9.8, 9.8, 0.0, -9.8]))['status'].tolist()
+    [3, 3, 3, 3]
+    """
+    v, h, x_pesawat, x_target, g = np.broadcast_arrays(
+        *(np.asarray(a, dtype=np.float64)
+          for a in (kecepatan_pesawat, ketinggian_pesawat, posisi_pesawat_x, posisi_target_x, g)))
+    hasil = np.empty(v.shape, dtype=HASIL_DTYPE)
+    waktu = hasil['waktu_jatuh']
+    horizontal = hasil['jarak_horizontal_paket']
+    drop = hasil['jarak_drop']
+    status = hasil['status']
+
+    # Rumus sama dengan versi skalar, ditulis langsung ke field hasil (out=)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        np.multiply(h, 2, out=waktu)
+        np.divide(waktu, g, out=waktu)
+        np.sqrt(waktu, out=waktu)
+    with np.errstate(invalid='ignore'):
+        np.multiply(v, waktu, out=horizontal)
+        np.subtract(x_target, x_pesawat, out=drop)
+        np.subtract(drop, horizontal, out=drop)
+
+        status.fill(STATUS_TUNGGU)
+        status[drop < v] = STATUS_JATUHKAN
+        status[drop <= 0] = STATUS_TERLAMBAT
+        # NaN tidak lolos perbandingan mana pun; tandai eksplisit. h < 0 dengan
+        # g < 0 menghasilkan waktu berhingga, jadi domain juga diperiksa.
+        status[~np.isfinite(drop) | ~(h >= 0) | ~(g > 0)] = STATUS_INVALID
+    return hasil
+
 
 def hitung_jarak_penjatuhan(kecepatan_pesawat, ketinggian_pesawat, posisi_pesawat_x, posisi_target_x, g=9.8):
     """
@@ -27,31 +112,73 @@ def hitung_jarak_penjatuhan(kecepatan_pesawat, ketinggian_pesawat, posisi_pesawa
         - status: status apakah paket harus dijatuhkan atau tidak
     """
     
-    # PERHITUNGAN FISIKA:
-    # 1. Gerak Vertikal (Jatuh Bebas): h = 1/2 * g * t²
-    #    Dari rumus ini: t = sqrt(2h/g)
+    # PERHITUNGAN FISIKA (dilakukan di hitung_jarak_penjatuhan_kode; versi
+    # array: hitung_jarak_penjatuhan_batch):
+    # 1. Gerak Vertikal (Jatuh Bebas): h = 1/2 * g * t²  ->  t = sqrt(2h/g)
+    # 2. Gerak Horizontal (GLB): x = v * t
+    # 3. Paket harus dijatuhkan SEBELUM target sejauh jarak horizontal paket:
+    #    jarak_drop = (posisi_target_x - posisi_pesawat_x) - x
+    # 4. Status: jarak_drop <= 0 -> terlambat; < kecepatan (dalam 1 detik
+    #    sampai) -> jatuhkan sekarang; selainnya -> terus terbang
+    jarak_drop, waktu_jatuh, jarak_horizontal_paket, kode = hitung_jarak_penjatuhan_kode(
+        kecepatan_pesawat, ketinggian_pesawat, posisi_pesawat_x, posisi_target_x, g)
+    return jarak_drop, waktu_jatuh, jarak_horizontal_paket, STATUS_TEKS[kode]
+
+
+def hitung_jarak_penjatuhan_kode(kecepatan_pesawat, ketinggian_pesawat, posisi_pesawat_x,
+                                 posisi_target_x, g=9.8):
+    """
+    Inti skalar (math, tanpa overhead NumPy untuk satu titik): sama dengan
+    hitung_jarak_penjatuhan tetapi status berupa kode int STATUS_*. Input
+    tidak valid -> (nan, nan, nan, STATUS_INVALID), sama dengan versi batch
+
+    >>> hitung_jarak_penjatuhan_kode(50.0, -10.0, 0.0, 600.0)[3] == STATUS_INVALID
+    True
+    """
+    if not (ketinggian_pesawat >= 0 and g > 0):
+        return math.nan, math.nan, math.nan, STATUS_INVALID
     waktu_jatuh = math.sqrt(2 * ketinggian_pesawat / g)
-    
-    # 2. Gerak Horizontal (GLB - Gerak Lurus Beraturan): x = v * t
-    #    Kecepatan horizontal tetap konstan (tidak ada percepatan horizontal)
     jarak_horizontal_paket = kecepatan_pesawat * waktu_jatuh
-    
-    # 3. Hitung jarak dari posisi pesawat saat ini ke target
-    jarak_ke_target = posisi_target_x - posisi_pesawat_x
-    
-    # 4. Hitung jarak yang harus ditempuh pesawat sebelum menjatuhkan paket
-    #    Paket harus dijatuhkan SEBELUM target sejauh jarak_horizontal_paket
-    jarak_drop = jarak_ke_target - jarak_horizontal_paket
-    
-    # 5. Tentukan status berdasarkan jarak drop
-    if jarak_drop <= 0:
-        status = "TERLAMBAT! Pesawat sudah melewati titik drop"
+    jarak_drop = (posisi_target_x - posisi_pesawat_x) - jarak_horizontal_paket
+    if not math.isfinite(jarak_drop):
+        kode = STATUS_INVALID
+    elif jarak_drop <= 0:
+        kode = STATUS_TERLAMBAT
     elif jarak_drop < kecepatan_pesawat:  # Dalam 1 detik akan sampai
-        status = "JATUHKAN SEKARANG!"
+        kode = STATUS_JATUHKAN
     else:
-        status = "Belum waktunya, terus terbang"
-    
-    return jarak_drop, waktu_jatuh, jarak_horizontal_paket, status
+        kode = STATUS_TUNGGU
+    return jarak_drop, waktu_jatuh, jarak_horizontal_paket, kode
+
+
+def benchmark_batch(jumlah=(10**6, 10**7), sampel_skalar=200000, seed=0):
+    """Throughput (evaluasi/detik) versi batch vs pemanggilan skalar per titik"""
+    rng = np.random.default_rng(seed)
+    laporan = []
+    for n in jumlah:
+        v = rng.uniform(10, 120, n)
+        h = rng.uniform(20, 1500, n)
+        x_pesawat = rng.uniform(-500, 500, n)
+        x_target = rng.uniform(0, 3000, n)
+
+        mulai = time.perf_counter()
+        hitung_jarak_penjatuhan_batch(v, h, x_pesawat, x_target)
+        batch_detik = time.perf_counter() - mulai
+
+        k = min(sampel_skalar, n)
+        titik = list(zip(v[:k].tolist(), h[:k].tolist(), x_pesawat[:k].tolist(),
+                         x_target[:k].tolist()))
+        mulai = time.perf_counter()
+        for args in titik:
+            hitung_jarak_penjatuhan(*args)
+        skalar_per_detik = k / (time.perf_counter() - mulai)
+
+        laporan.append({'evaluasi': n,
+                        'batch_detik': round(batch_detik, 3),
+                        'batch_per_detik': round(n / batch_detik),
+                        'skalar_per_detik': round(skalar_per_detik),
+                        'speedup': round(n / batch_detik / skalar_per_detik, 1)})
+    return laporan
 
 
 def tampilkan_visualisasi(posisi_pesawat_x, titik_drop, posisi_target_x):
@@ -218,4 +345,11 @@ def contoh_kasus():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Perhitungan penjatuhan paket")
+    parser.add_argument('--benchmark', action='store_true',
+                        help="Ukur throughput versi batch (10^6 dan 10^7 evaluasi)")
+    if parser.parse_args().benchmark:
+        for baris in benchmark_batch():
+            print(baris)
+    else:
+        main()
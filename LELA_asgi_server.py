@@ -0,0 +1,191 @@
+"""
+BACKEND ASYNCIO/ASGI UNTUK LELA CAMERA STREAMING SERVER
+
+Alternatif dari Flask+waitress: semua klien dilayani oleh satu event loop
+asyncio, sehingga puluhan penonton dan polling /status tidak berebut thread
+pool. Capture dan encode tetap dikerjakan producer FrameBroadcaster di luar
+event loop; setiap klien hanya menunggu frame baru secara async.
+
+Route yang dilayani sama dengan aplikasi Flask: /, /video_feed, /status,
+/metrics, /replay, /detection_feed dan /detections.
+
+Cara pakai:
+    python LELA_camera_streaming_server.py --backend asgi
+"""
+
+import asyncio
+import json
+import time
+from urllib.parse import parse_qs
+
+MJPEG_CONTENT_TYPE = b'multipart/x-mixed-replace; boundary=frame'
+
+
+class AsyncFrameWaiter:
+    """Menjembatani ClientSlot (thread producer) ke asyncio.Event di event loop"""
+
+    def __init__(self, loop):
+        self._loop = loop
+        self._event = asyncio.Event()
+
+    def notify(self):
+        # Dipanggil dari thread producer
+        self._loop.call_soon_threadsafe(self._event.set)
+
+    async def next_chunk(self, slot):
+        """Menunggu frame berikutnya; None jika slot sudah ditutup"""
+        while True:
+            self._event.clear()
+            chunk, closed = slot.get_nowait()
+            if chunk is not None:
+                return chunk
+            if closed:
+                return None
+            await self._event.wait()
+
+
+def create_asgi_app(server):
+    """
+    Membuat aplikasi ASGI dari modul server streaming.
+
+    server adalah modul LELA_camera_streaming_server yang sedang berjalan;
+    broadcaster, halaman index dan payload status diambil darinya agar kedua
+    backend selalu menyajikan hal yang sama.
+    """
+    flask_app = server.app
+
+    def render_flask_view(view, path):
+        with flask_app.test_request_context(path):
+            return view()
+
+    async def send_body(send, status, content_type, body):
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(b'content-type', content_type),
+                        (b'content-length', str(len(body)).encode())],
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+    async def watch_disconnect(receive, on_disconnect):
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                on_disconnect()
+                return
+
+    async def video_feed(scope, receive, send, broadcaster):
+        loop = asyncio.get_running_loop()
+        waiter = AsyncFrameWaiter(loop)
+        client = scope.get('client')
+        slot = broadcaster.subscribe(client[0] if client else None, notify=waiter.notify)
+
+        watcher = asyncio.ensure_future(watch_disconnect(receive, slot.close))
+        try:
+            await send({
+                'type': 'http.response.start',
+                'status': 200,
+                'headers': [(b'content-type', MJPEG_CONTENT_TYPE),
+                            (b'cache-control', b'no-cache')],
+            })
+            while True:
+                chunk = await waiter.next_chunk(slot)
+                if chunk is None:
+                    break
+                # send() menunggu flow control transport (backpressure per klien)
+                send_start = time.perf_counter()
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+                server.SEND_SECONDS.observe(time.perf_counter() - send_start)
+                slot.mark_sent(chunk)
+            await send({'type': 'http.response.body', 'body': b''})
+        except OSError:
+            pass
+        finally:
+            watcher.cancel()
+            broadcaster.unsubscribe(slot)
+
+    async def replay(scope, receive, send):
+        recorder = server.broadcaster.recorder
+        if recorder is None:
+            body = json.dumps({'error': 'Perekaman tidak aktif (jalankan dengan --record)'})
+            await send_body(send, 404, b'application/json', body.encode())
+            return
+        query = parse_qs(scope.get('query_string', b'').decode())
+        try:
+            seconds = float(query.get('seconds', ['30'])[0])
+        except ValueError:
+            seconds = 30.0
+
+        disconnected = asyncio.Event()
+        watcher = asyncio.ensure_future(watch_disconnect(receive, disconnected.set))
+        try:
+            await send({
+                'type': 'http.response.start',
+                'status': 200,
+                'headers': [(b'content-type', MJPEG_CONTENT_TYPE),
+                            (b'cache-control', b'no-cache')],
+            })
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            for offset, chunk in recorder.ring.replay_schedule(seconds):
+                delay = offset - (loop.time() - start)
+                if delay > 0:
+                    # Menunggu jadwal frame, tetapi berhenti segera jika klien putus
+                    try:
+                        await asyncio.wait_for(disconnected.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+                if disconnected.is_set():
+                    return
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            await send({'type': 'http.response.body', 'body': b''})
+        except OSError:
+            pass
+        finally:
+            watcher.cancel()
+
+    async def app(scope, receive, send):
+        if scope['type'] == 'lifespan':
+            while True:
+                message = await receive()
+                if message['type'] == 'lifespan.startup':
+                    await send({'type': 'lifespan.startup.complete'})
+                elif message['type'] == 'lifespan.shutdown':
+                    await send({'type': 'lifespan.shutdown.complete'})
+                    return
+
+        if scope['type'] != 'http':
+            return
+
+        path = scope['path']
+        if path == '/video_feed':
+            await video_feed(scope, receive, send, server.broadcaster)
+        elif path == '/detection_feed' and server.detection_broadcaster is not None:
+            await video_feed(scope, receive, send, server.detection_broadcaster)
+        elif path in ('/detection_feed', '/detections'):
+            payload = await asyncio.to_thread(render_flask_view, server.detections, path)
+            body, status = payload if isinstance(payload, tuple) else (payload, 200)
+            await send_body(send, status, b'application/json', json.dumps(body).encode())
+        elif path == '/':
+            html = await asyncio.to_thread(render_flask_view, server.index, '/')
+            await send_body(send, 200, b'text/html; charset=utf-8', html.encode('utf-8'))
+        elif path == '/status':
+            payload = await asyncio.to_thread(render_flask_view, server.status, '/status')
+            await send_body(send, 200, b'application/json', json.dumps(payload).encode())
+        elif path == '/replay':
+            await replay(scope, receive, send)
+        elif path == '/metrics':
+            body = server.metrics.render().encode('utf-8')
+            await send_body(send, 200, server.METRICS_CONTENT_TYPE.encode(), body)
+        else:
+            await send_body(send, 404, b'text/plain', b'Not Found')
+
+    return app
+
+
+def serve(server, host='0.0.0.0', port=5000):
+    """Menjalankan aplikasi ASGI dengan uvicorn (raise ImportError jika tidak ada)"""
+    import uvicorn
+
+    uvicorn.run(create_asgi_app(server), host=host, port=port,
+                log_level='warning', lifespan='on')
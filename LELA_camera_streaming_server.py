@@ -13,73 +13,519 @@ FITUR:
 - Web interface sederhana untuk viewing
 """
 
-from flask import Flask, render_template_string, Response
+from flask import Flask, render_template_string, Response, request
 import cv2
+import argparse
+import atexit
+import signal
 import threading
 import socket
+import sys
+import time
+
+import B1
+import stage_trace
+from edge_engine import EdgeEngine, default_workers
+from frame_recorder import FrameRecorder
+from frame_sources import create_frame_source
+from jpeg_encoder import EncodeStats, build_chunk, create_encoder
+from stream_metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsRegistry, RateMeter
+from zone_detector_stage import DetectorStage
+from zone_tracker import ZoneTracker
 
 app = Flask(__name__)
 
 # Konfigurasi
 CAMERA_INDEX = 0  # 0 untuk kamera default, 1 untuk kamera eksternal
+# Sumber frame: 'webcam', 'webcam:<index>', 'file:<path/glob>' atau 'synthetic'
+# (lihat frame_sources.py); selain webcam berguna untuk load test tanpa kamera
+FRAME_SOURCE = f'webcam:{CAMERA_INDEX}'
 FRAME_WIDTH = 640  # Resolusi lebih rendah = lebih efisien
 FRAME_HEIGHT = 480
 JPEG_QUALITY = 70  # 0-100, lebih rendah = file lebih kecil, kualitas lebih rendah
 FPS = 30  # Frame per second
+# Backend encoder JPEG: 'opencv', 'turbojpeg', 'pillow' atau 'auto'
+# (benchmark singkat saat start, pilih yang tercepat; lihat jpeg_encoder.py)
+JPEG_ENCODER = 'opencv'
+# Batas buffer kirim per klien di waitress; kecil = backpressure cepat terasa
+# sehingga klien lambat di-drop ke frame terbaru, bukan menumpuk di buffer
+SEND_BUFFER_BYTES = 256 * 1024
+
+# Adaptive bitrate: kualitas JPEG dan skala resolusi disesuaikan otomatis
+# berdasarkan ukuran frame ter-encode dan laju kirim ke klien
+ADAPTIVE_BITRATE = False
+ADAPTIVE_QUALITY_MIN = 30
+ADAPTIVE_QUALITY_MAX = 90
+ADAPTIVE_QUALITY_STEP = 5
+ADAPTIVE_SCALE_MIN = 0.5  # Skala resolusi terhadap FRAME_WIDTH x FRAME_HEIGHT
+ADAPTIVE_SCALE_MAX = 1.0
+ADAPTIVE_SCALE_STEP = 0.125
+ADAPTIVE_TARGET_FPS = FPS
+ADAPTIVE_BANDWIDTH_BUDGET = 250 * 1024  # Bytes per detik per klien (~2 Mbps)
+ADAPTIVE_INTERVAL = 1.0  # Detik antar penyesuaian
+
+# Perekaman: ring buffer frame ter-encode untuk /replay?seconds=N dan
+# (opsional) penyalinan ke file segmen di disk. Saat aktif, capture tetap
+# berjalan walaupun tidak ada penonton.
+RECORD_ENABLED = False
+RECORD_BUFFER_BYTES = 64 * 1024 * 1024  # Batas ring buffer di memori
+RECORD_SPILL_DIR = None  # Contoh: 'recordings'; None = hanya di memori
+RECORD_SEGMENT_BYTES = 256 * 1024 * 1024
+
+# Deteksi zona live (B1) di thread worker; stream ter-anotasi di /detection_feed
+DETECT_ENABLED = False
+# Pelacakan zona: deteksi penuh tiap N frame, optical flow di antaranya (0 = nonaktif)
+DETECT_TRACK_EVERY = 0
+
+# Trace per tahap (stage_trace) ditulis ke berkas JSON Chrome saat server
+# berhenti; None = nonaktif (atau environment LELA_TRACE=<path>)
+TRACE_PATH = None
 
 # Global variable untuk kamera
 camera = None
 camera_lock = threading.Lock()
 
+# Metrik server untuk /metrics (format teks Prometheus)
+metrics = MetricsRegistry()
+CAPTURE_SECONDS = metrics.histogram('lela_capture_seconds', 'Durasi cam.read() per frame')
+ENCODE_SECONDS = metrics.histogram('lela_encode_seconds', 'Durasi encode JPEG per frame')
+SEND_SECONDS = metrics.histogram('lela_send_seconds', 'Durasi kirim satu frame ke satu klien')
+FRAMES_CAPTURED = metrics.counter('lela_frames_captured_total', 'Jumlah frame yang di-capture')
+FRAMES_SENT = metrics.counter('lela_frames_sent_total', 'Jumlah frame terkirim ke semua klien')
+FRAMES_DROPPED = metrics.counter('lela_frames_dropped_total', 'Jumlah frame yang di-drop karena klien lambat')
+BYTES_SENT = metrics.counter('lela_bytes_sent_total', 'Jumlah bytes terkirim ke semua klien')
+bytes_rate = RateMeter(BYTES_SENT)
+metrics.gauge('lela_bytes_per_second', 'Laju bytes terkirim ke semua klien', bytes_rate.rate)
+metrics.gauge('lela_encode_fps_per_core', 'Frame ter-encode per CPU-detik encode',
+              lambda: broadcaster.encode_stats.fps_per_core)
+metrics.gauge('lela_clients', 'Jumlah klien /video_feed yang terhubung',
+              lambda: broadcaster.client_count)
+
 
 def get_camera():
-    """Inisialisasi dan mengembalikan objek kamera"""
+    """Inisialisasi dan mengembalikan objek kamera (sumber frame)"""
     global camera
     if camera is None:
         with camera_lock:
             if camera is None:
-                camera = cv2.VideoCapture(CAMERA_INDEX)
-                camera.set(cv2.CAP_PROP_FRAME_WIDTH, FRAME_WIDTH)
-                camera.set(cv2.CAP_PROP_FRAME_HEIGHT, FRAME_HEIGHT)
-                camera.set(cv2.CAP_PROP_FPS, FPS)
-                # Buffer kecil untuk mengurangi latensi
-                camera.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+                camera = create_frame_source(FRAME_SOURCE, FRAME_WIDTH, FRAME_HEIGHT, FPS)
     return camera
 
 
-def generate_frames():
+class ClientSlot:
+    """
+    Antrian per klien dengan kedalaman 1 (drop-to-latest).
+
+    Frame yang belum sempat diambil klien langsung diganti frame terbaru,
+    sehingga klien lambat tidak menumpuk frame dan latensinya tetap terbatas.
+    """
+
+    def __init__(self, client_id, remote_addr=None, notify=None):
+        self._cond = threading.Condition()
+        self._chunk = None
+        self._closed = False
+        # Callback opsional saat ada frame baru / slot ditutup (dipakai
+        # backend asyncio untuk membangunkan event loop dari thread producer)
+        self._notify = notify
+        self.client_id = client_id
+        self.remote_addr = remote_addr
+        self.connected_at = time.time()
+        self.frames_sent = 0
+        self.frames_dropped = 0
+        self.bytes_sent = 0
+
+    def put(self, chunk):
+        """Dipanggil producer; mengganti frame yang belum dikonsumsi"""
+        with self._cond:
+            if self._chunk is not None:
+                self.frames_dropped += 1
+                FRAMES_DROPPED.inc()
+            self._chunk = chunk
+            self._cond.notify()
+        if self._notify is not None:
+            self._notify()
+
+    def get(self):
+        """Menunggu frame berikutnya; None jika slot sudah ditutup"""
+        with self._cond:
+            while self._chunk is None and not self._closed:
+                self._cond.wait()
+            chunk = self._chunk
+            self._chunk = None
+            return chunk
+
+    def get_nowait(self):
+        """Mengambil frame tanpa menunggu; (chunk, closed)"""
+        with self._cond:
+            chunk = self._chunk
+            self._chunk = None
+            return chunk, self._closed
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._notify is not None:
+            self._notify()
+
+    def mark_sent(self, chunk):
+        self.frames_sent += 1
+        self.bytes_sent += len(chunk)
+        FRAMES_SENT.inc()
+        BYTES_SENT.inc(len(chunk))
+
+    def stats(self):
+        uptime = max(time.time() - self.connected_at, 1e-6)
+        return {
+            'id': self.client_id,
+            'remote_addr': self.remote_addr,
+            'uptime_s': round(uptime, 1),
+            'frames_sent': self.frames_sent,
+            'frames_dropped': self.frames_dropped,
+            'bytes_sent': self.bytes_sent,
+            'send_fps': round(self.frames_sent / uptime, 1),
+        }
+
+
+class AdaptiveController:
+    """
+    Pengatur kualitas JPEG dan skala resolusi berdasarkan throughput terukur.
+
+    Setiap ADAPTIVE_INTERVAL detik controller membandingkan perkiraan
+    bandwidth (rata-rata ukuran frame x target FPS) dengan budget, dan laju
+    kirim klien paling lambat dengan laju produksi frame. Jika jaringan
+    kewalahan, kualitas diturunkan dulu lalu resolusi; jika longgar,
+    resolusi dinaikkan dulu lalu kualitas. Semua langkah dibatasi oleh
+    konfigurasi ADAPTIVE_*.
+    """
+
+    def __init__(self, enabled=None):
+        # enabled=None: pakai ADAPTIVE_BITRATE saat objek dibuat (bisa diubah --adaptive)
+        self.enabled = False
+        self.quality = JPEG_QUALITY
+        self.scale = 1.0
+        self.avg_frame_bytes = 0.0
+        self.produced_fps = 0.0
+        self.slowest_client_fps = None
+        self._frames = 0
+        self._window_start = time.time()
+        self._client_sent = {}
+        self.set_enabled(ADAPTIVE_BITRATE if enabled is None else enabled)
+
+    def set_enabled(self, enabled):
+        """Mengaktifkan/menonaktifkan adaptasi; saat aktif kualitas awal dibatasi ADAPTIVE_QUALITY_*"""
+        self.enabled = enabled
+        if enabled:
+            self.quality = min(max(JPEG_QUALITY, ADAPTIVE_QUALITY_MIN), ADAPTIVE_QUALITY_MAX)
+            self.scale = ADAPTIVE_SCALE_MAX
+
+    def observe_frame(self, nbytes):
+        # Rata-rata bergerak eksponensial ukuran frame ter-encode
+        if self.avg_frame_bytes == 0:
+            self.avg_frame_bytes = float(nbytes)
+        else:
+            self.avg_frame_bytes += 0.1 * (nbytes - self.avg_frame_bytes)
+        self._frames += 1
+
+    def maybe_update(self, slots):
+        now = time.time()
+        elapsed = now - self._window_start
+        if elapsed < ADAPTIVE_INTERVAL:
+            return
+
+        self.produced_fps = self._frames / elapsed
+        client_fps = []
+        sent = {}
+        for slot in slots:
+            sent[slot.client_id] = slot.frames_sent
+            if slot.client_id in self._client_sent:
+                client_fps.append((slot.frames_sent - self._client_sent[slot.client_id]) / elapsed)
+        self._client_sent = sent
+        self.slowest_client_fps = min(client_fps) if client_fps else None
+        self._frames = 0
+        self._window_start = now
+
+        if self.enabled:
+            self._adjust()
+
+    def _adjust(self):
+        target_fps = min(ADAPTIVE_TARGET_FPS, self.produced_fps) or ADAPTIVE_TARGET_FPS
+        bandwidth = self.avg_frame_bytes * target_fps
+        client_lagging = (self.slowest_client_fps is not None
+                          and self.slowest_client_fps < 0.8 * target_fps)
+
+        if bandwidth > ADAPTIVE_BANDWIDTH_BUDGET or client_lagging:
+            if self.quality > ADAPTIVE_QUALITY_MIN:
+                self.quality = max(self.quality - ADAPTIVE_QUALITY_STEP, ADAPTIVE_QUALITY_MIN)
+            elif self.scale > ADAPTIVE_SCALE_MIN:
+                self.scale = max(self.scale - ADAPTIVE_SCALE_STEP, ADAPTIVE_SCALE_MIN)
+        elif bandwidth < 0.6 * ADAPTIVE_BANDWIDTH_BUDGET and not client_lagging:
+            if self.scale < ADAPTIVE_SCALE_MAX:
+                self.scale = min(self.scale + ADAPTIVE_SCALE_STEP, ADAPTIVE_SCALE_MAX)
+            elif self.quality < ADAPTIVE_QUALITY_MAX:
+                self.quality = min(self.quality + ADAPTIVE_QUALITY_STEP, ADAPTIVE_QUALITY_MAX)
+
+    def prepare(self, frame):
+        """Menerapkan skala resolusi saat ini pada frame"""
+        if self.scale < 1.0:
+            frame = cv2.resize(frame, None, fx=self.scale, fy=self.scale,
+                               interpolation=cv2.INTER_AREA)
+        return frame
+
+    def status(self):
+        return {
+            'enabled': self.enabled,
+            'jpeg_quality': self.quality,
+            'scale': self.scale,
+            'resolution': f'{int(FRAME_WIDTH * self.scale)}x{int(FRAME_HEIGHT * self.scale)}',
+            'avg_frame_bytes': int(self.avg_frame_bytes),
+            'produced_fps': round(self.produced_fps, 1),
+            'slowest_client_fps': (None if self.slowest_client_fps is None
+                                   else round(self.slowest_client_fps, 1)),
+            'est_bandwidth_bytes_s': int(self.avg_frame_bytes * self.produced_fps),
+            'bandwidth_budget_bytes_s': ADAPTIVE_BANDWIDTH_BUDGET,
+            'target_fps': ADAPTIVE_TARGET_FPS,
+        }
+
+
+class FrameBroadcaster:
+    """
+    Satu thread producer yang membaca kamera dan meng-encode setiap frame
+    SEKALI, lalu membagikan hasilnya ke semua klien.
+
+    Setiap klien punya ClientSlot sendiri, sehingga semua klien menerima
+    bytes yang sama tanpa frame basi maupun duplikat, dan klien lambat hanya
+    kehilangan frame (tercatat di frames_dropped) tanpa memperlambat klien
+    lain. Producer berhenti otomatis ketika tidak ada klien lagi.
+    """
+
+    def __init__(self, controller=None, source=None, instrumented=True):
+        # source: objek dengan read(); None = kamera global (get_camera)
+        # instrumented: catat metrik capture/encode global (hanya stream mentah)
+        self.source = source
+        self.instrumented = instrumented
+        self._lock = threading.Lock()
+        self._slots = {}
+        self.controller = controller or AdaptiveController()
+        self.encoder = None
+        self.encode_stats = EncodeStats()
+        self.recorder = None  # FrameRecorder; jika ada, producer selalu jalan
+        # Listener frame mentah (frame, captured_at), mis. tahap deteksi;
+        # jika ada, producer selalu jalan
+        self.frame_listeners = []
+        self._next_client_id = 1
+        self._thread = None
+
+    @property
+    def client_count(self):
+        return len(self._slots)
+
+    def client_stats(self):
+        with self._lock:
+            slots = list(self._slots.values())
+        return [slot.stats() for slot in slots]
+
+    def encoder_status(self):
+        status = self.encode_stats.status()
+        status['backend'] = self.encoder.name if self.encoder else JPEG_ENCODER
+        status['benchmark_fps'] = getattr(self.encoder, 'benchmark', None)
+        return status
+
+    def _ensure_running(self):
+        # Dipanggil dengan self._lock terkunci
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._capture_loop, daemon=True)
+            self._thread.start()
+
+    def start_recording(self, recorder):
+        """Mulai merekam; producer tetap berjalan walau tanpa klien"""
+        with self._lock:
+            self.recorder = recorder
+            self._ensure_running()
+
+    def add_frame_listener(self, listener):
+        """Mendaftarkan listener frame mentah; harus cepat dan tidak memblokir"""
+        with self._lock:
+            self.frame_listeners = self.frame_listeners + [listener]
+            self._ensure_running()
+
+    def subscribe(self, remote_addr=None, notify=None):
+        with self._lock:
+            slot = ClientSlot(self._next_client_id, remote_addr, notify)
+            self._next_client_id += 1
+            self._slots[slot.client_id] = slot
+            self._ensure_running()
+        return slot
+
+    def unsubscribe(self, slot):
+        with self._lock:
+            self._slots.pop(slot.client_id, None)
+        slot.close()
+
+    def _capture_loop(self):
+        try:
+            self._produce()
+        finally:
+            # Kamera gagal dibaca atau producer error: tutup semua klien agar
+            # generator mereka selesai, dan izinkan producer baru dimulai.
+            # Jika producer berhenti karena tanpa penonton, _thread sudah
+            # di-reset (dan mungkin sudah diisi producer baru), jadi dilewati.
+            with self._lock:
+                failed = self._thread is threading.current_thread()
+                if failed:
+                    self._thread = None
+                    slots = list(self._slots.values())
+            if failed:
+                for slot in slots:
+                    slot.close()
+
+    def _produce(self):
+        cam = self.source if self.source is not None else get_camera()
+        controller = self.controller
+
+        while True:
+            read_start = time.perf_counter()
+            with stage_trace.stage('stream.capture') as traced_stage:
+                success, frame = cam.read()
+                if not success:
+                    break
+                traced_stage.add_bytes(frame.nbytes)
+            captured_at = time.time()
+            if self.instrumented:
+                CAPTURE_SECONDS.observe(time.perf_counter() - read_start)
+                FRAMES_CAPTURED.inc()
+
+            with stage_trace.stage('stream.listeners', frame.nbytes):
+                for listener in self.frame_listeners:
+                    listener(frame, captured_at)
+
+            # Encode frame ke JPEG untuk kompresi (sekali untuk semua klien)
+            with stage_trace.stage('stream.prepare', frame.nbytes):
+                frame = controller.prepare(frame)
+            if self.encoder is None:
+                self.encoder = create_encoder(JPEG_ENCODER, frame, controller.quality)
+            cpu_start, wall_start = time.thread_time(), time.perf_counter()
+            with stage_trace.stage('stream.encode', frame.nbytes):
+                jpeg = self.encoder.encode(frame, controller.quality)
+            wall_time = time.perf_counter() - wall_start
+            self.encode_stats.record(time.thread_time() - cpu_start, wall_time)
+            if self.instrumented:
+                ENCODE_SECONDS.observe(wall_time)
+            if jpeg is None:
+                continue
+            controller.observe_frame(jpeg.nbytes)
+
+            # X-Timestamp = waktu capture (detik epoch) agar klien bisa
+            # menghitung latensi end-to-end yang sebenarnya
+            with stage_trace.stage('stream.build_chunk', jpeg.nbytes):
+                chunk = build_chunk(jpeg, captured_at)
+            if self.recorder is not None:
+                with stage_trace.stage('stream.record', len(chunk)):
+                    self.recorder.record(captured_at, chunk)
+
+            with self._lock:
+                slots = list(self._slots.values())
+                if not slots and self.recorder is None and not self.frame_listeners:
+                    # Tidak ada penonton, hentikan producer
+                    self._thread = None
+                    return
+
+            with stage_trace.stage('stream.publish', len(chunk) * len(slots)):
+                for slot in slots:
+                    slot.put(chunk)
+            controller.maybe_update(slots)
+
+    def frames(self, remote_addr=None):
+        """Generator per klien yang menghasilkan chunk multipart bersama"""
+        slot = self.subscribe(remote_addr)
+        try:
+            while True:
+                chunk = slot.get()
+                if chunk is None:
+                    return
+                send_start = time.perf_counter()
+                with stage_trace.stage('stream.send', len(chunk)):
+                    yield chunk
+                # Generator dilanjutkan = chunk sudah diterima server WSGI
+                SEND_SECONDS.observe(time.perf_counter() - send_start)
+                slot.mark_sent(chunk)
+        finally:
+            self.unsubscribe(slot)
+
+
+broadcaster = FrameBroadcaster()
+
+# Tahap deteksi zona (diaktifkan dengan --detect): stream ter-anotasi punya
+# broadcaster sendiri dengan sumber frame dari DetectorStage
+detector_stage = None
+detection_broadcaster = None
+detection_engine = None  # EdgeEngine (jika > 1 core), hanya dipakai thread worker deteksi
+zone_tracker = None      # ZoneTracker, hanya dipakai thread worker deteksi
+
+
+def detect_zones(frame):
+    """Deteksi zona B1 pada frame; mengembalikan (frame ter-anotasi, hasil JSON)"""
+    if zone_tracker is not None:
+        tracks = zone_tracker.update(frame)
+        return zone_tracker.draw(frame), [track.to_dict() for track in tracks]
+    annotated, detections = B1.detect_and_draw(frame, engine=detection_engine)
+    return annotated, [zone.to_dict() for zone in detections.zones]
+
+
+def start_detection(track_every=DETECT_TRACK_EVERY):
+    """Mengaktifkan tahap deteksi live di atas stream kamera"""
+    global detector_stage, detection_broadcaster, detection_engine, zone_tracker
+    # EdgeEngine hanya menguntungkan jika jalur channel bisa berjalan paralel;
+    # di mesin satu core dipakai pipeline B1 biasa
+    detection_engine = EdgeEngine() if default_workers() > 1 else None
+    if track_every:
+        detect_fn = detection_engine.detect if detection_engine is not None else B1.detect
+        zone_tracker = ZoneTracker(detect_fn, detect_every=track_every)
+    detector_stage = DetectorStage(detect_zones)
+    detector_stage.start()
+    # Hentikan worker sebelum interpreter keluar (worker bisa sedang di dalam OpenCV)
+    atexit.register(detector_stage.stop)
+    metrics.register(detector_stage.processed)
+    metrics.gauge('lela_detections_per_second', 'Throughput tahap deteksi zona',
+                  detector_stage.rate.rate)
+    detection_broadcaster = FrameBroadcaster(source=detector_stage, instrumented=False)
+    broadcaster.add_frame_listener(detector_stage.submit)
+
+
+def generate_frames(remote_addr=None):
     """
     Generator function untuk menghasilkan frame video
-    Menggunakan motion JPEG untuk streaming
+    Menggunakan motion JPEG untuk streaming; capture dan encode dilakukan
+    oleh satu producer bersama (lihat FrameBroadcaster)
     """
-    cam = get_camera()
-    
-    while True:
-        success, frame = cam.read()
-        if not success:
-            break
-        
-        # Encode frame ke JPEG untuk kompresi
-        encode_param = [int(cv2.IMWRITE_JPEG_QUALITY), JPEG_QUALITY]
-        ret, buffer = cv2.imencode('.jpg', frame, encode_param)
-        
-        if not ret:
-            continue
-        
-        frame_bytes = buffer.tobytes()
-        
-        # Yield frame dalam format multipart
-        yield (b'--frame\r\n'
-               b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
+    yield from broadcaster.frames(remote_addr)
 
 
 @app.route('/video_feed')
 def video_feed():
     """Route untuk streaming video"""
-    return Response(generate_frames(),
+    return Response(generate_frames(request.remote_addr),
                     mimetype='multipart/x-mixed-replace; boundary=frame')
 
 
+@app.route('/detection_feed')
+def detection_feed():
+    """Route streaming video dengan anotasi DROPZONE/LANDZONE/BUCKET"""
+    if detection_broadcaster is None:
+        return {'error': 'Deteksi tidak aktif (jalankan dengan --detect)'}, 404
+    return Response(detection_broadcaster.frames(request.remote_addr),
+                    mimetype='multipart/x-mixed-replace; boundary=frame')
+
+
+@app.route('/detections')
+def detections():
+    """Route hasil deteksi terbaru (JSON)"""
+    if detector_stage is None:
+        return {'error': 'Deteksi tidak aktif (jalankan dengan --detect)'}, 404
+    return {'stage': detector_stage.status(), 'latest': detector_stage.latest_results(),
+            'tracker': zone_tracker.status() if zone_tracker else None}
+
+
 @app.route('/')
 def index():
     """Halaman utama dengan player video"""
@@ -192,10 +638,48 @@ def status():
         'port': 5000,
         'resolution': f'{FRAME_WIDTH}x{FRAME_HEIGHT}',
         'jpeg_quality': JPEG_QUALITY,
-        'fps': FPS
+        'fps': FPS,
+        'client_count': broadcaster.client_count,
+        'clients': broadcaster.client_stats(),
+        'adaptive': broadcaster.controller.status(),
+        'encoder': broadcaster.encoder_status(),
+        'recorder': broadcaster.recorder.status() if broadcaster.recorder else None,
+        'detector': detector_stage.status() if detector_stage else None
     }
 
 
+def replay_frames(seconds):
+    """
+    Generator replay MJPEG untuk `seconds` detik terakhir dari ring buffer,
+    diputar dengan jeda asli antar frame
+    """
+    recorder = broadcaster.recorder
+    if recorder is None:
+        return
+    start = time.perf_counter()
+    for offset, chunk in recorder.ring.replay_schedule(seconds):
+        delay = offset - (time.perf_counter() - start)
+        if delay > 0:
+            time.sleep(delay)
+        yield chunk
+
+
+@app.route('/replay')
+def replay():
+    """Route replay beberapa detik terakhir (default 30 detik)"""
+    if broadcaster.recorder is None:
+        return {'error': 'Perekaman tidak aktif (jalankan dengan --record)'}, 404
+    seconds = request.args.get('seconds', default=30.0, type=float)
+    return Response(replay_frames(seconds),
+                    mimetype='multipart/x-mixed-replace; boundary=frame')
+
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Route metrik server dalam format teks Prometheus"""
+    return Response(metrics.render(), mimetype=METRICS_CONTENT_TYPE)
+
+
 def get_local_ip():
     """Mendapatkan IP address lokal"""
     try:
@@ -210,6 +694,49 @@ def get_local_ip():
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="LELA camera streaming server")
+    parser.add_argument('--backend', choices=['flask', 'asgi'], default='flask',
+                        help="flask: Flask+waitress (thread per klien), "
+                             "asgi: asyncio/uvicorn (satu event loop)")
+    parser.add_argument('--source', default=FRAME_SOURCE,
+                        help="webcam[:index], file:<path/glob> atau synthetic")
+    parser.add_argument('--width', type=int, default=FRAME_WIDTH)
+    parser.add_argument('--height', type=int, default=FRAME_HEIGHT)
+    parser.add_argument('--fps', type=int, default=FPS)
+    parser.add_argument('--encoder', choices=['opencv', 'turbojpeg', 'pillow', 'auto'],
+                        default=JPEG_ENCODER)
+    parser.add_argument('--adaptive', action='store_true', default=ADAPTIVE_BITRATE,
+                        help="Sesuaikan kualitas/resolusi JPEG dengan bandwidth klien")
+    parser.add_argument('--record', action='store_true', default=RECORD_ENABLED,
+                        help="Rekam frame ke ring buffer untuk /replay")
+    parser.add_argument('--record-dir', default=RECORD_SPILL_DIR,
+                        help="Direktori file segmen (default: hanya di memori)")
+    parser.add_argument('--detect', action='store_true', default=DETECT_ENABLED,
+                        help="Aktifkan deteksi zona live di /detection_feed dan /detections")
+    parser.add_argument('--track-every', type=int, default=DETECT_TRACK_EVERY,
+                        help="Deteksi penuh tiap N frame, lacak zona dengan optical flow "
+                             "di antaranya (0 = deteksi setiap frame)")
+    parser.add_argument('--trace', default=TRACE_PATH, metavar='PATH',
+                        help="Catat durasi per tahap (capture, encode, kirim, deteksi) dan "
+                             "tulis trace JSON Chrome ke PATH saat server berhenti")
+    args = parser.parse_args()
+
+    JPEG_ENCODER = args.encoder
+    if JPEG_ENCODER != 'auto':
+        # Validasi saat start: library opsional yang tidak terpasang tidak
+        # boleh baru gagal di thread producer
+        try:
+            broadcaster.encoder = create_encoder(JPEG_ENCODER)
+        except Exception as e:
+            print(f"PERINGATAN: encoder '{JPEG_ENCODER}' tidak tersedia ({e}); memakai opencv")
+            JPEG_ENCODER = 'opencv'
+
+    FRAME_SOURCE = args.source
+    FRAME_WIDTH, FRAME_HEIGHT = args.width, args.height
+    FPS = ADAPTIVE_TARGET_FPS = args.fps
+    ADAPTIVE_BITRATE = args.adaptive
+    broadcaster.controller.set_enabled(ADAPTIVE_BITRATE)
+
     print("="*70)
     print("LELA CAMERA STREAMING SERVER")
     print("="*70)
@@ -221,8 +748,33 @@ if __name__ == '__main__':
         print("Pastikan kamera terhubung dan tidak digunakan aplikasi lain.")
         exit(1)
     
-    print("Kamera berhasil diinisialisasi")
+    print(f"Kamera berhasil diinisialisasi ({FRAME_SOURCE})")
     print(f"Resolusi: {FRAME_WIDTH}x{FRAME_HEIGHT}, Kualitas: {JPEG_QUALITY}%, FPS: {FPS}")
+    if ADAPTIVE_BITRATE:
+        print(f"Bitrate adaptif aktif: kualitas awal {broadcaster.controller.quality}% "
+              f"({ADAPTIVE_QUALITY_MIN}-{ADAPTIVE_QUALITY_MAX}%)")
+
+    if args.record:
+        recorder = FrameRecorder(RECORD_BUFFER_BYTES, args.record_dir, RECORD_SEGMENT_BYTES)
+        # Saat server berhenti: tulis sisa antrean dan potong segmen yang dialokasikan di awal
+        atexit.register(recorder.close)
+        broadcaster.start_recording(recorder)
+        print(f"Perekaman aktif: ring buffer {RECORD_BUFFER_BYTES // (1024 * 1024)} MB"
+              + (f", segmen di {args.record_dir}" if args.record_dir else ""))
+
+    if args.detect:
+        start_detection(args.track_every)
+        print("Deteksi zona aktif: /detection_feed dan /detections")
+
+    if args.trace:
+        stage_trace.enable()
+        atexit.register(stage_trace.export_chrome_trace, args.trace)
+        print(f"Trace per tahap aktif, ditulis ke {args.trace} saat server berhenti")
+
+    # SIGTERM keluar lewat jalur shutdown normal (atexit: trace, perekaman),
+    # sama seperti Ctrl+C. uvicorn menangkap sinyal selama serve lalu
+    # meneruskannya ke handler ini setelah shutdown.
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
     
     local_ip = get_local_ip()
     
@@ -236,11 +788,21 @@ if __name__ == '__main__':
     print("-"*70)
     print("\nServer starting...\n")
     
+    if args.backend == 'asgi':
+        try:
+            import LELA_asgi_server
+            print("Menggunakan backend asyncio/ASGI (uvicorn)\n")
+            LELA_asgi_server.serve(sys.modules[__name__], host='0.0.0.0', port=5000)
+            sys.exit(0)
+        except ImportError:
+            print("uvicorn tidak terpasang (pip install uvicorn), kembali ke Flask\n")
+
     # Jalankan server Flask
     try:
         from waitress import serve
         print("Menggunakan Waitress WSGI server\n")
-        serve(app, host='0.0.0.0', port=5000, threads=4)
+        serve(app, host='0.0.0.0', port=5000, threads=4,
+              outbuf_high_watermark=SEND_BUFFER_BYTES)
     except ImportError:
         print("Menggunakan Flask development server\n")
         import os
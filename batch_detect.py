@@ -0,0 +1,178 @@
+"""
+DETEKSI ZONA B1 SECARA BATCH UNTUK ANALISIS PASCA-TERBANG
+
+Menjalankan B1.detect atas direktori / glob berisi ribuan frame tanpa
+mengedit IMAGE_PATH di B1.py:
+
+- Berkas dibagi menjadi chunk dan diproses di ProcessPoolExecutor
+  (jumlah worker dan ukuran chunk bisa diatur)
+- Di dalam setiap worker, decode gambar berikutnya berjalan di thread
+  prefetch sementara gambar saat ini dideteksi (cv2.imread melepas GIL)
+- Hasil ditulis sebagai JSON Lines sesuai urutan selesai (bukan urutan
+  input), satu baris per gambar, langsung di-flush
+- Gambar ter-anotasi hanya ditulis jika --annotate-dir diberikan, dengan
+  nama <indeks input>_<nama berkas>_detected.png agar nama sama tidak bentrok
+- Di akhir dilaporkan images/sec dan rata-rata waktu per tahap (stderr)
+
+Contoh:
+    python batch_detect.py frames/ --workers 4 --chunksize 16 -o hasil.jsonl
+    python batch_detect.py "flight_01/*.jpg" --annotate-dir annotated
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+import cv2
+
+import B1
+from frame_sources import expand_inputs
+
+STAGES = ('decode', 'detect', 'annotate')
+
+
+def _init_worker():
+    # Paralelisme dari proses; thread internal OpenCV hanya menambah kontensi
+    cv2.setNumThreads(1)
+
+
+def _annotated_path(path, annotate_dir, index):
+    # Indeks input sebagai awalan: a/x.png dan b/x.jpg tidak saling menimpa
+    name, _ = os.path.splitext(os.path.basename(path))
+    return os.path.join(annotate_dir, f'{index:06d}_{name}_detected.png')
+
+
+def detect_chunk(paths, annotate_dir=None, first_index=0):
+    """
+    Dijalankan di worker: deteksi setiap berkas, decode berikutnya di-prefetch.
+    first_index: indeks input berkas pertama chunk (untuk nama berkas anotasi)
+    """
+    results = []
+    with ThreadPoolExecutor(max_workers=1) as prefetch:
+        pending = prefetch.submit(_decode, paths[0]) if paths else None
+        for i, path in enumerate(paths):
+            img, decode_seconds = pending.result()
+            if i + 1 < len(paths):
+                pending = prefetch.submit(_decode, paths[i + 1])
+
+            timings = {'decode': decode_seconds}
+            if img is None:
+                results.append({'path': path, 'error': 'gagal membaca gambar',
+                                'timings_ms': _ms(timings)})
+                continue
+
+            start = time.perf_counter()
+            detections = B1.detect(img)
+            timings['detect'] = time.perf_counter() - start
+
+            record = {'path': path, 'shape': list(img.shape)}
+            if annotate_dir:
+                start = time.perf_counter()
+                out_path = _annotated_path(path, annotate_dir, first_index + i)
+                cv2.imwrite(out_path, B1.draw_detections(img, detections))
+                timings['annotate'] = time.perf_counter() - start
+                record['annotated'] = out_path
+            record.update(detections.to_dict())
+            record['timings_ms'] = _ms(timings)
+            results.append(record)
+    return results
+
+
+def _decode(path):
+    start = time.perf_counter()
+    img = cv2.imread(path)
+    return img, time.perf_counter() - start
+
+
+def _ms(timings):
+    return {stage: round(1000 * seconds, 3) for stage, seconds in timings.items()}
+
+
+def run_batch(paths, out, workers=None, chunksize=8, annotate_dir=None):
+    """
+    Memproses semua berkas dan menulis JSON Lines ke `out` sesuai urutan
+    selesai; mengembalikan ringkasan (images/sec, waktu per tahap)
+    """
+    if annotate_dir:
+        os.makedirs(annotate_dir, exist_ok=True)
+    chunks = [(i, paths[i:i + chunksize]) for i in range(0, len(paths), chunksize)]
+    totals = dict.fromkeys(STAGES, 0.0)
+    counts = dict.fromkeys(STAGES, 0)
+    processed = errors = 0
+
+    workers = workers or os.cpu_count() or 1
+    # Batasi chunk yang sedang berjalan agar memori tetap kecil untuk ribuan berkas
+    max_in_flight = 2 * workers
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        queued = iter(chunks)
+        running = set()
+        while True:
+            while len(running) < max_in_flight:
+                chunk = next(queued, None)
+                if chunk is None:
+                    break
+                first_index, chunk_paths = chunk
+                running.add(pool.submit(detect_chunk, chunk_paths, annotate_dir, first_index))
+            if not running:
+                break
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                for record in future.result():
+                    out.write(json.dumps(record) + '\n')
+                    processed += 1
+                    errors += 'error' in record
+                    for stage, ms in record['timings_ms'].items():
+                        totals[stage] += ms
+                        counts[stage] += 1
+                out.flush()
+    elapsed = time.perf_counter() - start
+
+    return {
+        'images': processed,
+        'errors': errors,
+        'seconds': round(elapsed, 3),
+        'images_per_second': round(processed / elapsed, 2) if elapsed else 0.0,
+        'mean_stage_ms': {stage: round(totals[stage] / counts[stage], 3)
+                          for stage in STAGES if counts[stage]},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Deteksi zona B1 secara batch (JSON Lines)")
+    parser.add_argument('inputs', nargs='+', help="Direktori, glob atau berkas gambar")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Jumlah proses worker (default: jumlah CPU)")
+    parser.add_argument('--chunksize', type=int, default=8,
+                        help="Jumlah gambar per tugas worker")
+    parser.add_argument('-o', '--output', default='-',
+                        help="Berkas JSON Lines keluaran (default: stdout)")
+    parser.add_argument('--annotate-dir', default=None,
+                        help="Tulis gambar ter-anotasi ke direktori ini")
+    args = parser.parse_args(argv)
+
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        print("Tidak ada berkas gambar yang cocok", file=sys.stderr)
+        return 1
+
+    out = sys.stdout if args.output == '-' else open(args.output, 'w')
+    try:
+        summary = run_batch(paths, out, args.workers, max(args.chunksize, 1), args.annotate_dir)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    print(f"{summary['images']} gambar ({summary['errors']} gagal) dalam {summary['seconds']} s "
+          f"-> {summary['images_per_second']} gambar/detik", file=sys.stderr)
+    for stage, ms in summary['mean_stage_ms'].items():
+        print(f"  {stage:<9} rata-rata {ms:.2f} ms", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,313 @@
+"""
+BENCHMARK HEADLESS UNTUK HOT PATH PROYEK
+
+Setiap script proyek adalah demo (plt.show, cv2.imshow, input()), jadi
+regresi performa tidak terlihat. Harness ini menjalankan kasus-kasus
+berikut tanpa GUI:
+
+- stream    : generate_frames (FrameBroadcaster + encode JPEG + slot
+              klien) dengan SyntheticSource di beberapa resolusi/kualitas
+- detect    : B1.detect per frame pada sEuidy5yWe9A.png (skala 1x, 2x)
+- filters   : apply_canny, apply_sobel, apply_bilateral pada tulip.jpg
+- mask      : binary_mask.create_binary_mask
+- drop      : hitung_jarak_penjatuhan_batch (10^6 evaluasi per iterasi)
+
+Per kasus dilaporkan persentil latensi per iterasi (p50/p90/p99),
+throughput item/detik dan puncak alokasi memori (tracemalloc, diukur
+pada iterasi terpisah agar overhead tracing tidak masuk ke latensi).
+Hasil ditulis ke JSON; --baseline membandingkan dengan hasil sebelumnya
+dan keluar dengan kode 1 jika p50 atau memori melewati ambang regresi.
+
+Perbandingan jalur optimasi (EdgeEngine, piramida, filter graph, Sobel
+cepat) terdaftar sebagai kasus di sini. Fungsi benchmark() per modul
+memakai time_runs / median_ms dari modul ini, bukan salinan loop sendiri.
+
+Contoh:
+    python benchmarks.py --output hasil_baseline.json
+    python benchmarks.py --baseline hasil_baseline.json --max-regression 0.25
+    python benchmarks.py --filter detect filters --runs 50
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+# Gambar contoh dicari di direktori skrip, bukan direktori kerja
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_image(name, scale=1):
+    path = os.path.join(ROOT, name)
+    image = cv2.imread(path)
+    if image is None:
+        raise FileNotFoundError(f"Gambar benchmark tidak bisa dibaca: {path}")
+    if scale != 1:
+        image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_LINEAR)
+    return image
+
+
+class Case:
+    """Satu kasus benchmark; setup() -> fungsi satu iterasi (dan teardown opsional)"""
+
+    __slots__ = ('name', 'setup', 'items', 'runs')
+
+    def __init__(self, name, setup, items=1, runs=None):
+        self.name = name
+        self.setup = setup
+        self.items = items     # Item yang diproses per iterasi (untuk throughput)
+        self.runs = runs       # None = pakai --runs
+
+
+def _detect_case(scale):
+    def setup():
+        import B1
+        image = load_image(B1.IMAGE_PATH, scale)
+        return lambda: B1.detect(image), None
+    return setup
+
+
+def _edges_case(engine):
+    def setup():
+        import B1
+        image = load_image(B1.IMAGE_PATH)
+        params = B1.DetectionParams()
+        if not engine:
+            return lambda: (B1.find_edges(image, params), B1.blur_for_circles(image, params)), None
+        from edge_engine import EdgeEngine
+        edge_engine = EdgeEngine(params)
+        return lambda: edge_engine.process(image), edge_engine.close
+    return setup
+
+
+def _pyramid_case(scale):
+    def setup():
+        import B1
+        from pyramid_detect import detect_pyramid
+        image = load_image(B1.IMAGE_PATH)
+        return lambda: detect_pyramid(image, scale=scale), None
+    return setup
+
+
+def _graph_case():
+    import image_filters
+    from filter_graph import DEFAULT_OUTPUTS, default_graph
+    image = load_image(image_filters.IMAGE_PATH)
+    graph = default_graph()
+    return lambda: graph.run(image, DEFAULT_OUTPUTS), None
+
+
+def _separate_filters_case():
+    import image_filters
+    image = load_image(image_filters.IMAGE_PATH)
+    return lambda: (image_filters.apply_canny(image), image_filters.apply_sobel(image),
+                    image_filters.apply_bilateral(image)), None
+
+
+def _sobel_fast_case():
+    import image_filters
+    image = load_image(image_filters.IMAGE_PATH)
+    workspace = image_filters.SobelWorkspace()
+    return lambda: image_filters.apply_sobel(image, fast=True, workspace=workspace), None
+
+
+def _filter_case(name):
+    def setup():
+        import image_filters
+        image = load_image(image_filters.IMAGE_PATH)
+        fn = getattr(image_filters, name)
+        return lambda: fn(image), None
+    return setup
+
+
+def _mask_case(threshold):
+    def setup():
+        import B1
+        import binary_mask
+        image = load_image(B1.IMAGE_PATH)
+        return lambda: binary_mask.create_binary_mask(image, threshold), None
+    return setup
+
+
+def _drop_case(count):
+    def setup():
+        from Gamaforce_C5 import hitung_jarak_penjatuhan_batch
+        rng = np.random.default_rng(0)
+        v = rng.uniform(10, 120, count)
+        h = rng.uniform(20, 1500, count)
+        x_pesawat = rng.uniform(-500, 500, count)
+        x_target = rng.uniform(0, 3000, count)
+        return lambda: hitung_jarak_penjatuhan_batch(v, h, x_pesawat, x_target), None
+    return setup
+
+
+def _stream_case(width, height, quality):
+    def setup():
+        import LELA_camera_streaming_server as server
+        from frame_sources import SyntheticSource
+
+        controller = server.AdaptiveController(enabled=False)
+        controller.quality = quality
+        broadcaster = server.FrameBroadcaster(controller, SyntheticSource(width, height, fps=0),
+                                              instrumented=False)
+        frames = broadcaster.frames('benchmark')
+        next(frames)  # Producer berjalan, encoder terpilih
+        return lambda: next(frames), frames.close
+    return setup
+
+
+def default_cases():
+    cases = []
+    for width, height in ((320, 240), (640, 480), (1280, 720)):
+        for quality in (50, 80):
+            cases.append(Case(f'stream/generate_frames_{width}x{height}_q{quality}',
+                              _stream_case(width, height, quality)))
+    cases.append(Case('detect/B1_1x', _detect_case(1)))
+    cases.append(Case('detect/B1_2x', _detect_case(2)))
+    cases.append(Case('detect/edges_B1', _edges_case(False)))
+    cases.append(Case('detect/edges_EdgeEngine', _edges_case(True)))
+    cases.append(Case('detect/pyramid_0.5', _pyramid_case(0.5)))
+    for name in ('apply_canny', 'apply_sobel', 'apply_bilateral'):
+        cases.append(Case(f'filters/{name}', _filter_case(name)))
+    cases.append(Case('filters/apply_sobel_fast', _sobel_fast_case))
+    cases.append(Case('filters/separate_canny_sobel_bilateral', _separate_filters_case))
+    cases.append(Case('filters/graph_canny_sobel_bilateral', _graph_case))
+    cases.append(Case('mask/create_binary_mask', _mask_case(60)))
+    cases.append(Case('drop/hitung_jarak_penjatuhan_batch_1e6', _drop_case(10**6),
+                      items=10**6, runs=10))
+    return cases
+
+
+def time_runs(fn, runs, warmup=0):
+    """(durasi per pemanggilan dalam detik, hasil pemanggilan terakhir)"""
+    result = None
+    for _ in range(warmup):
+        result = fn()
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return times, result
+
+
+def median_ms(fn, runs, warmup=0):
+    """(median milidetik per pemanggilan, hasil pemanggilan terakhir)"""
+    times, result = time_runs(fn, runs, warmup)
+    return 1000 * float(np.median(times)), result
+
+
+def percentile(sorted_values, p):
+    return sorted_values[min(int(p * len(sorted_values)), len(sorted_values) - 1)]
+
+
+def run_case(case, runs, warmup=3):
+    iteration, teardown = case.setup()
+    try:
+        times, _ = time_runs(iteration, case.runs or runs, warmup)
+
+        tracemalloc.start()
+        iteration()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    finally:
+        if teardown is not None:
+            teardown()
+
+    times.sort()
+    mean = sum(times) / len(times)
+    return {
+        'runs': len(times),
+        'p50_ms': round(1000 * percentile(times, 0.50), 4),
+        'p90_ms': round(1000 * percentile(times, 0.90), 4),
+        'p99_ms': round(1000 * percentile(times, 0.99), 4),
+        'mean_ms': round(1000 * mean, 4),
+        'min_ms': round(1000 * times[0], 4),
+        'items_per_second': round(case.items / mean, 2),
+        'peak_bytes': peak,
+    }
+
+
+def environment():
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': np.__version__,
+        'opencv': cv2.__version__,
+        'opencv_threads': cv2.getNumThreads(),
+    }
+
+
+def compare(results, baseline, max_regression, max_memory_regression):
+    """Daftar pesan regresi: p50 atau puncak memori naik melewati ambang"""
+    failures = []
+    for name, current in results['cases'].items():
+        previous = baseline.get('cases', {}).get(name)
+        if previous is None:
+            continue
+        if current['p50_ms'] > previous['p50_ms'] * (1 + max_regression):
+            failures.append(f"{name}: p50 {previous['p50_ms']} -> {current['p50_ms']} ms")
+        if current['peak_bytes'] > previous['peak_bytes'] * (1 + max_memory_regression) + 4096:
+            failures.append(f"{name}: memori {previous['peak_bytes']} -> {current['peak_bytes']} B")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark headless hot path proyek")
+    parser.add_argument('--filter', nargs='*', default=None,
+                        help="Hanya kasus yang namanya mengandung salah satu teks ini")
+    parser.add_argument('--runs', type=int, default=30, help="Iterasi terukur per kasus")
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--baseline', default=None, help="Hasil JSON sebelumnya untuk dibandingkan")
+    parser.add_argument('--max-regression', type=float, default=0.25,
+                        help="Batas kenaikan relatif p50 (0.25 = 25%%)")
+    parser.add_argument('--max-memory-regression', type=float, default=0.5,
+                        help="Batas kenaikan relatif puncak memori")
+    parser.add_argument('--list', action='store_true', help="Tampilkan nama kasus saja")
+    args = parser.parse_args(argv)
+
+    cases = default_cases()
+    if args.filter:
+        cases = [c for c in cases if any(text in c.name for text in args.filter)]
+    if args.list:
+        for case in cases:
+            print(case.name)
+        return 0
+
+    results = {'environment': environment(), 'cases': {}}
+    for case in cases:
+        try:
+            result = run_case(case, args.runs)
+        except FileNotFoundError as e:
+            print(f"ERROR ({case.name}): {e}", file=sys.stderr)
+            return 2
+        results['cases'][case.name] = result
+        print(f"{case.name:<45} p50 {result['p50_ms']:>9.3f} ms  p99 {result['p99_ms']:>9.3f} ms  "
+              f"{result['items_per_second']:>12.1f}/s  peak {result['peak_bytes'] / 1024:>9.1f} KiB")
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nHasil ditulis ke {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        failures = compare(results, baseline, args.max_regression, args.max_memory_regression)
+        if failures:
+            print("\nREGRESI:")
+            for message in failures:
+                print(f"  {message}")
+            return 1
+        print("Tidak ada regresi dibanding baseline")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
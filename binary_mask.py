@@ -1,21 +1,131 @@
+import argparse
+
 import cv2
 import numpy as np
-import matplotlib.pyplot as plt
+
+from stage_trace import traced
 
 IMAGE_PATH = "bQ1E5K67D6wb.png"
 
-def create_binary_mask(image, threshold_value=127):
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    _, binary = cv2.threshold(gray, threshold_value, 255, cv2.THRESH_BINARY_INV)
+MODES = ('fixed', 'otsu', 'triangle', 'adaptive')
+
+def to_gray(image):
+    return image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+@traced('binary_mask.create_binary_mask')
+def create_binary_mask(image, threshold_value=127, mode='fixed', block_size=31, c=5):
+    """
+    Piksel gelap (gray <= threshold) -> 255, terang -> 0.
+    mode: 'fixed' (threshold_value), 'otsu' / 'triangle' (threshold dihitung
+    otomatis per gambar), 'adaptive' (threshold lokal Gaussian per blok
+    block_size x block_size dikurangi c; tahan perubahan pencahayaan)
+    """
+    gray = to_gray(image)
+    if mode == 'fixed':
+        _, binary = cv2.threshold(gray, threshold_value, 255, cv2.THRESH_BINARY_INV)
+    elif mode == 'otsu':
+        _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+    elif mode == 'triangle':
+        _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_TRIANGLE)
+    elif mode == 'adaptive':
+        binary = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                                       cv2.THRESH_BINARY_INV, block_size, c)
+    else:
+        raise ValueError(f"Mode tidak dikenal: {mode} (pilihan: {', '.join(MODES)})")
     return binary
 
+def auto_threshold(image, mode='otsu'):
+    """Nilai threshold yang dipilih Otsu / triangle untuk gambar"""
+    flag = {'otsu': cv2.THRESH_OTSU, 'triangle': cv2.THRESH_TRIANGLE}[mode]
+    value, _ = cv2.threshold(to_gray(image), 0, 255, cv2.THRESH_BINARY_INV | flag)
+    return int(value)
+
+@traced('binary_mask.gray_histogram')
+def gray_histogram(image, histogram=None):
+    """
+    Histogram grayscale 256 bin (int64); jika histogram diberikan, hasil
+    ditambahkan ke situ sehingga satu histogram bisa mengumpulkan banyak gambar
+    """
+    counts = np.bincount(to_gray(image).ravel(), minlength=256).astype(np.int64)
+    if histogram is None:
+        return counts
+    histogram += counts
+    return histogram
+
+def sweep_counts(histogram):
+    """
+    Jumlah piksel foreground (mask 255, gray <= t) untuk SETIAP threshold
+    t = 0..255 dari satu histogram, O(256)
+
+    >>> gray = np.array([[0, 50, 100], [150, 200, 250]], dtype=np.uint8)
+    >>> counts = sweep_counts(gray_histogram(gray))
+    >>> [int(counts[t]) for t in (0, 49, 50, 127, 255)]
+    [1, 1, 2, 3, 6]
+    >>> all(int(counts[t]) == int(np.count_nonzero(create_binary_mask(gray, t)))
+    ...     for t in range(256))
+    True
+    """
+    return np.cumsum(histogram)
+
+def sweep_fractions(histogram):
+    """Fraksi foreground per threshold (0..1) dari histogram"""
+    total = histogram.sum()
+    return sweep_counts(histogram) / total if total else np.zeros(256)
+
+def otsu_from_histogram(histogram):
+    """
+    Threshold Otsu dari histogram (mis. histogram gabungan satu dataset),
+    sama dengan cv2.THRESH_OTSU untuk histogram satu gambar
+
+    >>> gray = cv2.imread('tulip.jpg', cv2.IMREAD_GRAYSCALE)
+    >>> otsu_from_histogram(gray_histogram(gray)) == auto_threshold(gray)
+    True
+    """
+    hist = histogram.astype(np.float64)
+    total = hist.sum()
+    if not total:
+        return 0
+    levels = np.arange(256)
+    weight0 = np.cumsum(hist) / total
+    weight1 = 1.0 - weight0
+    cum_mean = np.cumsum(hist * levels) / total
+    mean_total = cum_mean[-1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        between = (mean_total * weight0 - cum_mean) ** 2 / (weight0 * weight1)
+    between[~np.isfinite(between)] = 0
+    return int(np.argmax(between))
+
+@traced('binary_mask.masks_for_thresholds')
+def masks_for_thresholds(image, thresholds):
+    """Mask hanya untuk threshold terpilih; gray dihitung sekali. {threshold: mask}"""
+    gray = to_gray(image)
+    return {t: create_binary_mask(gray, t) for t in thresholds}
+
 def main():
-    image = cv2.imread(IMAGE_PATH)
+    # Hanya tampilan interaktif yang butuh matplotlib; mode tiled/batch tetap headless
+    import matplotlib.pyplot as plt
+
+    parser = argparse.ArgumentParser(description="Binary mask")
+    parser.add_argument('image', nargs='?', default=IMAGE_PATH)
+    parser.add_argument('--mode', choices=MODES, default='fixed')
+    parser.add_argument('--threshold', type=int, default=60)
+    parser.add_argument('--sweep', type=int, nargs='*', default=None,
+                        help="Cetak fraksi foreground untuk threshold ini (kosong = tiap 16)")
+    args = parser.parse_args()
+
+    image = cv2.imread(args.image)
     if image is None:
         print("Error: Gambar tidak ditemukan")
         return
-    
-    binary_mask = create_binary_mask(image, threshold_value=60)
+
+    if args.mode in ('otsu', 'triangle'):
+        print(f"Threshold {args.mode}: {auto_threshold(image, args.mode)}")
+    if args.sweep is not None:
+        fractions = sweep_fractions(gray_histogram(image))
+        for t in args.sweep or range(0, 256, 16):
+            print(f"  threshold {t:3d}: foreground {100 * fractions[t]:.2f}%")
+
+    binary_mask = create_binary_mask(image, threshold_value=args.threshold, mode=args.mode)
     
     print("Binary mask berhasil dibuat!")
     
@@ -0,0 +1,356 @@
+"""
+KEPUTUSAN PENJATUHAN REAL-TIME DARI STREAM TELEMETRI
+
+Gamaforce_C5.main() hanya membaca empat nilai sekali dari input(). Dalam
+penerbangan posisi dan kecepatan datang 50-100 Hz; modul ini memperbarui
+keputusan per sampel:
+
+- DropDecider.update(sample) menghitung jarak_drop untuk setiap sampel
+  (parabola vakum Gamaforce_C5, atau ReleaseTable dari release_solver
+  untuk model drag/angin) dan MEMPREDIKSI timestamp rilis yang tepat:
+  t_rilis = t + jarak_drop / kecepatan. Status JATUHKAN dikeluarkan sekali
+  pada sampel terakhir sebelum t_rilis (t_rilis jatuh sebelum sampel
+  berikutnya diperkirakan datang), sehingga aktuator bisa menjadwalkan
+  rilis tepat di t_rilis, bukan menunggu jendela 1 detik
+- Jika titik drop terlewati di antara dua sampel tanpa keputusan,
+  waktu lewatnya diinterpolasi linear dan status menjadi TERLAMBAT
+- Latensi keputusan per sampel diukur (target < 100 us)
+- Paket/baris telemetri rusak dihitung (LinkStats) lalu dibuang; loop
+  keputusan tetap berjalan
+
+Sumber telemetri (baris "t,x,kecepatan,ketinggian[,angin]"):
+    file:<path>       replay berkas CSV (opsional --realtime)
+    udp:<host>:<port> datagram UDP (pengganti link telemetri lokal)
+    sim               penerbangan sintetis 100 Hz
+dengan --async, sumber UDP dibaca lewat asyncio.
+
+Contoh:
+    python drop_stream.py sim --target 1500 --record telemetri.csv
+    python drop_stream.py file:telemetri.csv --target 1500 --table tabel_rilis.npz
+    python drop_stream.py udp:127.0.0.1:14550 --target 1500 --async
+"""
+
+import argparse
+import array
+import asyncio
+import math
+import socket
+import time
+
+from Gamaforce_C5 import (STATUS_INVALID, STATUS_JATUHKAN, STATUS_TEKS, STATUS_TERLAMBAT,
+                          STATUS_TUNGGU,
+                          hitung_jarak_penjatuhan_kode)
+
+
+class TelemetrySample:
+    __slots__ = ('timestamp', 'x', 'speed', 'altitude', 'wind')
+
+    def __init__(self, timestamp, x, speed, altitude, wind=0.0):
+        self.timestamp = timestamp
+        self.x = x
+        self.speed = speed
+        self.altitude = altitude
+        self.wind = wind
+
+    @classmethod
+    def parse(cls, line):
+        """
+        Baris 't,x,kecepatan,ketinggian[,angin]' (str atau bytes) -> sampel;
+        None untuk baris kosong/komentar. ValueError jika rusak (jumlah field
+        salah, bukan angka, bytes bukan UTF-8) atau tidak masuk akal (nilai
+        NaN / inf, kecepatan <= 0, ketinggian < 0 mis. noise altimeter)
+
+        >>> TelemetrySample.parse(b'1.5,10,50,500').speed
+        50.0
+        >>> TelemetrySample.parse('1,2,3')
+        Traceback (most recent call last):
+        ...
+        ValueError: Sampel telemetri butuh 4 atau 5 field, didapat 3
+        >>> TelemetrySample.parse('0.01,0.5,50,-0.3')
+        Traceback (most recent call last):
+        ...
+        ValueError: Ketinggian negatif: -0.3
+        """
+        if isinstance(line, bytes):
+            line = line.decode()  # UnicodeDecodeError adalah ValueError
+        line = line.strip()
+        if not line or line.startswith('#'):
+            return None
+        fields = line.split(',')
+        if not 4 <= len(fields) <= 5:
+            raise ValueError(f"Sampel telemetri butuh 4 atau 5 field, didapat {len(fields)}")
+        values = [float(value) for value in fields]
+        if not all(math.isfinite(value) for value in values):
+            raise ValueError(f"Nilai tidak berhingga: {line}")
+        sample = cls(*values)
+        if sample.speed <= 0:
+            raise ValueError(f"Kecepatan harus positif: {sample.speed}")
+        if sample.altitude < 0:
+            raise ValueError(f"Ketinggian negatif: {sample.altitude}")
+        return sample
+
+    def to_line(self):
+        return f'{self.timestamp:.4f},{self.x:.4f},{self.speed:.4f},{self.altitude:.4f},{self.wind:.4f}'
+
+
+class LinkStats:
+    """Jumlah paket/baris telemetri yang diterima dan yang dibuang karena rusak"""
+
+    __slots__ = ('received', 'malformed')
+
+    def __init__(self):
+        self.received = 0
+        self.malformed = 0
+
+    def parse(self, data):
+        """TelemetrySample.parse yang tidak pernah gagal: paket rusak dihitung lalu dibuang"""
+        self.received += 1
+        try:
+            return TelemetrySample.parse(data)
+        except ValueError:
+            self.malformed += 1
+            return None
+
+    def to_dict(self):
+        return {'received': self.received, 'malformed': self.malformed}
+
+
+class Decision:
+    __slots__ = ('status', 'jarak_drop', 'release_at', 'timestamp')
+
+    def __init__(self, status, jarak_drop, release_at, timestamp):
+        self.status = status
+        self.jarak_drop = jarak_drop
+        self.release_at = release_at
+        self.timestamp = timestamp
+
+    def to_dict(self):
+        return {'timestamp': self.timestamp, 'status': STATUS_TEKS[self.status],
+                'jarak_drop': round(self.jarak_drop, 3), 'release_at': self.release_at}
+
+
+class DropDecider:
+    """Keputusan penjatuhan inkremental per sampel telemetri"""
+
+    def __init__(self, target_x, table=None, g=9.8):
+        # table: release_solver.ReleaseTable (drag + angin); None = parabola vakum
+        self.target_x = target_x
+        self.table = table
+        self.g = g
+        self.decided = None           # Decision JATUHKAN / TERLAMBAT final
+        self._prev = None             # (timestamp, jarak_drop)
+        self._interval = None         # Perkiraan jarak antar sampel (EMA)
+        self.latencies_ns = array.array('q')
+
+    def _travel(self, sample):
+        if self.table is not None:
+            return self.table.query(sample.speed, sample.altitude, sample.wind)[1]
+        return hitung_jarak_penjatuhan_kode(sample.speed, sample.altitude, 0.0, 0.0, self.g)[2]
+
+    def update(self, sample):
+        """Memproses satu sampel; mengembalikan Decision untuk sampel ini"""
+        start = time.perf_counter_ns()
+        t = sample.timestamp
+        jarak_drop = (self.target_x - sample.x) - self._travel(sample)
+        if not math.isfinite(jarak_drop):
+            # Sampel di luar domain model (mis. dibuat langsung tanpa parse):
+            # dilewati tanpa mengubah state keputusan
+            self.latencies_ns.append(time.perf_counter_ns() - start)
+            return Decision(STATUS_INVALID, jarak_drop, None, t)
+
+        if self._prev is not None:
+            dt = t - self._prev[0]
+            if dt > 0:
+                self._interval = dt if self._interval is None else 0.9 * self._interval + 0.1 * dt
+
+        if self.decided is not None:
+            decision = Decision(self.decided.status, jarak_drop, self.decided.release_at, t)
+        elif jarak_drop <= 0:
+            # Titik drop terlewat di antara sampel: interpolasi waktu lewatnya
+            release_at = t
+            if self._prev is not None and self._prev[1] > 0:
+                prev_t, prev_drop = self._prev
+                release_at = prev_t + prev_drop / (prev_drop - jarak_drop) * (t - prev_t)
+            decision = self.decided = Decision(STATUS_TERLAMBAT, jarak_drop, release_at, t)
+        else:
+            release_at = t + jarak_drop / sample.speed if sample.speed > 0 else None
+            horizon = self._interval if self._interval is not None else 0.0
+            if release_at is not None and release_at <= t + horizon:
+                decision = self.decided = Decision(STATUS_JATUHKAN, jarak_drop, release_at, t)
+            else:
+                decision = Decision(STATUS_TUNGGU, jarak_drop, release_at, t)
+
+        self._prev = (t, jarak_drop)
+        self.latencies_ns.append(time.perf_counter_ns() - start)
+        return decision
+
+    def latency_summary(self):
+        values = sorted(self.latencies_ns)
+        if not values:
+            return {}
+
+        def pct(p):
+            return round(values[min(int(p * len(values)), len(values) - 1)] / 1000, 2)
+
+        return {'samples': len(values), 'p50_us': pct(0.5), 'p99_us': pct(0.99),
+                'max_us': round(values[-1] / 1000, 2)}
+
+
+def file_telemetry(path, realtime=False, stats=None):
+    """Replay berkas telemetri; realtime=True menjaga jarak waktu antar sampel"""
+    stats = stats or LinkStats()
+    wall_start = first = None
+    with open(path) as f:
+        for line in f:
+            sample = stats.parse(line)
+            if sample is None:
+                continue
+            if realtime:
+                if first is None:
+                    first, wall_start = sample.timestamp, time.perf_counter()
+                delay = (sample.timestamp - first) - (time.perf_counter() - wall_start)
+                if delay > 0:
+                    time.sleep(delay)
+            yield sample
+
+
+def udp_telemetry(host, port, timeout=None, stats=None):
+    """
+    Sampel dari datagram UDP (satu baris per datagram). Default menunggu
+    terus (link telemetri bisa putus sementara); timeout (detik) opsional
+    mengakhiri stream jika tidak ada datagram selama itu. Datagram rusak
+    dihitung di stats (LinkStats) dan dibuang
+    """
+    stats = stats or LinkStats()
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind((host, port))
+    sock.settimeout(timeout)
+    try:
+        while True:
+            try:
+                data, _ = sock.recvfrom(512)
+            except socket.timeout:
+                return
+            sample = stats.parse(data)
+            if sample is not None:
+                yield sample
+    finally:
+        sock.close()
+
+
+class _TelemetryProtocol(asyncio.DatagramProtocol):
+    def __init__(self, queue, stats):
+        self.queue = queue
+        self.stats = stats
+
+    def datagram_received(self, data, addr):
+        sample = self.stats.parse(data)
+        if sample is not None:
+            self.queue.put_nowait(sample)
+
+
+async def async_udp_telemetry(host, port, timeout=None, stats=None):
+    """Versi asyncio dari udp_telemetry (async iterator)"""
+    stats = stats or LinkStats()
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    transport, _ = await loop.create_datagram_endpoint(lambda: _TelemetryProtocol(queue, stats),
+                                                       local_addr=(host, port))
+    try:
+        while True:
+            try:
+                yield await asyncio.wait_for(queue.get(), timeout)  # None = tunggu terus
+            except asyncio.TimeoutError:
+                return
+    finally:
+        transport.close()
+
+
+def simulate_telemetry(speed=50.0, altitude=500.0, start_x=0.0, duration=40.0, rate=100.0,
+                       wind=0.0):
+    """Penerbangan lurus kecepatan konstan (timestamp simulasi, tanpa menunggu)"""
+    samples = int(duration * rate)
+    for i in range(samples):
+        t = i / rate
+        yield TelemetrySample(t, start_x + speed * t, speed, altitude, wind)
+
+
+def run(samples, decider, verbose=True):
+    """Memproses stream sinkron; mengembalikan keputusan final (atau None)"""
+    for sample in samples:
+        decision = decider.update(sample)
+        if decision.status != STATUS_TUNGGU and decision is decider.decided:
+            if verbose:
+                print(f"[t={sample.timestamp:.3f}] {STATUS_TEKS[decision.status]} "
+                      f"(rilis tepat di t={decision.release_at:.4f})")
+    return decider.decided
+
+
+async def run_async(samples, decider, verbose=True):
+    async for sample in samples:
+        decision = decider.update(sample)
+        if decision.status != STATUS_TUNGGU and decision is decider.decided:
+            if verbose:
+                print(f"[t={sample.timestamp:.3f}] {STATUS_TEKS[decision.status]} "
+                      f"(rilis tepat di t={decision.release_at:.4f})")
+    return decider.decided
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keputusan penjatuhan dari stream telemetri")
+    parser.add_argument('source', help="file:<path>, udp:<host>:<port> atau sim")
+    parser.add_argument('--target', type=float, required=True, help="Posisi target (m)")
+    parser.add_argument('--table', default=None,
+                        help="ReleaseTable .npz (release_solver) untuk model drag/angin")
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help="Baca sumber UDP lewat asyncio")
+    parser.add_argument('--timeout', type=float, default=None,
+                        help="Akhiri sumber UDP jika tidak ada datagram selama N detik "
+                             "(default: tunggu terus)")
+    parser.add_argument('--realtime', action='store_true', help="Replay berkas dengan jeda asli")
+    parser.add_argument('--record', default=None, help="Simpan telemetri simulasi ke berkas")
+    parser.add_argument('--speed', type=float, default=50.0, help="Kecepatan simulasi (m/s)")
+    parser.add_argument('--altitude', type=float, default=500.0, help="Ketinggian simulasi (m)")
+    args = parser.parse_args()
+
+    table = None
+    if args.table:
+        from release_solver import ReleaseTable
+        table = ReleaseTable.load(args.table)
+    decider = DropDecider(args.target, table)
+    stats = LinkStats()
+
+    kind, _, rest = args.source.partition(':')
+    if kind == 'sim':
+        samples = list(simulate_telemetry(args.speed, args.altitude))
+        if args.record:
+            with open(args.record, 'w') as f:
+                f.write('# t,x,kecepatan,ketinggian,angin\n')
+                f.writelines(s.to_line() + '\n' for s in samples)
+            print(f"Telemetri simulasi disimpan di {args.record}")
+        decided = run(samples, decider)
+        if decided is not None and decided.status == STATUS_JATUHKAN:
+            exact = (args.target - decider._travel(samples[0])) / args.speed
+            print(f"Waktu rilis sebenarnya t={exact:.4f}, "
+                  f"galat prediksi {1000 * abs(decided.release_at - exact):.3f} ms")
+    elif kind == 'file':
+        run(file_telemetry(rest, args.realtime, stats), decider)
+    elif kind == 'udp':
+        host, _, port = rest.rpartition(':')
+        if args.use_async:
+            asyncio.run(run_async(async_udp_telemetry(host, int(port), args.timeout, stats),
+                                  decider))
+        else:
+            run(udp_telemetry(host, int(port), args.timeout, stats), decider)
+    else:
+        parser.error(f"Sumber tidak dikenal: {args.source}")
+
+    if decider.decided is None:
+        print("Belum ada keputusan (titik drop belum tercapai)")
+    print(f"Latensi keputusan per sampel: {decider.latency_summary()}")
+    if stats.received:
+        print(f"Paket telemetri: {stats.to_dict()}")
+
+
+if __name__ == '__main__':
+    main()
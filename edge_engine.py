@@ -0,0 +1,152 @@
+"""
+ENGINE EDGE TEROPTIMASI UNTUK DETEKSI B1
+
+Menghasilkan keluaran yang sama persis dengan B1.find_edges dan
+B1.blur_for_circles, tetapi:
+
+- Semua buffer antara (channel, blur, median, Canny, closing, gray) dan
+  buffer keluaran dialokasikan sekali per ukuran frame lalu dipakai ulang
+  lewat argumen dst= OpenCV
+- Tiga channel B, G, R dan jalur grayscale untuk HoughCircles diproses
+  bersamaan di thread pool (fungsi OpenCV melepas GIL). Ukuran pool
+  mengikuti os.cpu_count() (maks. 4); dengan satu worker keempat jalur
+  dijalankan langsung di thread pemanggil tanpa pool, karena overhead
+  pool di mesin satu core membuat engine lebih lambat dari B1
+- Mode verify membandingkan setiap hasil dengan pipeline asli B1
+
+Catatan: jalur kontur (Gaussian 9x9 sigma 1.5 per channel) dan jalur
+lingkaran (Gaussian 11x11 sigma 2 pada grayscale) memakai kernel berbeda,
+sehingga tidak ada smoothing yang bisa dibagi tanpa mengubah hasil; yang
+dibagi hanya frame sumber dan buffer kerja.
+
+Buffer hasil process() dipakai ulang pada panggilan berikutnya; satu engine
+hanya untuk satu thread pemanggil.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+import B1
+
+
+MAX_WORKERS = 4  # Tiga channel + jalur grayscale
+
+
+def default_workers():
+    return min(MAX_WORKERS, os.cpu_count() or 1)
+
+
+class EdgeEngine:
+    def __init__(self, params=None, workers=None, verify=False):
+        self.params = params or B1.DetectionParams()
+        self.verify = verify
+        self.workers = workers or default_workers()
+        self._pool = ThreadPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+        self._shape = None
+        size = self.params.close_kernel_size
+        self._kernel = np.ones((size, size), np.uint8)
+
+    def _allocate(self, shape):
+        height, width = shape[:2]
+
+        def plane():
+            return np.empty((height, width), np.uint8)
+
+        self._channel = [plane() for _ in range(3)]
+        self._blur = [plane() for _ in range(3)]
+        self._median = [plane() for _ in range(3)]
+        self._canny = [plane() for _ in range(3)]
+        self._closed = [plane() for _ in range(3)]
+        self._edges = plane()
+        self._gray = plane()
+        self._gray_blur = plane()
+        self._circle_blur = plane()
+        self._shape = shape
+
+    def _channel_edges(self, frame, i):
+        p = self.params
+        ksize = (p.channel_blur_ksize, p.channel_blur_ksize)
+        cv2.extractChannel(frame, i, dst=self._channel[i])
+        cv2.GaussianBlur(self._channel[i], ksize, p.channel_blur_sigma, dst=self._blur[i])
+        cv2.medianBlur(self._blur[i], p.median_ksize, dst=self._median[i])
+        cv2.Canny(self._median[i], p.canny_low, p.canny_high, edges=self._canny[i])
+        cv2.morphologyEx(self._canny[i], cv2.MORPH_CLOSE, self._kernel, dst=self._closed[i],
+                         iterations=p.close_iterations)
+
+    def _circle_prep(self, frame):
+        p = self.params
+        ksize = (p.circle_blur_ksize, p.circle_blur_ksize)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        cv2.GaussianBlur(self._gray, ksize, p.circle_blur_sigma, dst=self._gray_blur)
+        cv2.medianBlur(self._gray_blur, p.median_ksize, dst=self._circle_blur)
+
+    def process(self, frame):
+        """Mengembalikan (edges, blur_for_circles) untuk frame BGR"""
+        if frame.shape != self._shape:
+            self._allocate(frame.shape)
+
+        if self._pool is None:
+            for i in range(3):
+                self._channel_edges(frame, i)
+            self._circle_prep(frame)
+        else:
+            futures = [self._pool.submit(self._channel_edges, frame, i) for i in range(3)]
+            futures.append(self._pool.submit(self._circle_prep, frame))
+            for future in futures:
+                future.result()
+
+        # Urutan OR sama dengan B1: r | (g | b)
+        cv2.bitwise_or(self._closed[1], self._closed[0], dst=self._edges)
+        cv2.bitwise_or(self._closed[2], self._edges, dst=self._edges)
+
+        if self.verify:
+            self.check(frame, self._edges, self._circle_blur)
+        return self._edges, self._circle_blur
+
+    def check(self, frame, edges, circle_blur):
+        """Membandingkan hasil dengan pipeline asli B1; RuntimeError jika berbeda"""
+        ref_edges = B1.find_edges(frame, self.params)
+        ref_blur = B1.blur_for_circles(frame, self.params)
+        edge_diff = int(np.count_nonzero(ref_edges != edges))
+        blur_diff = int(np.count_nonzero(ref_blur != circle_blur))
+        if edge_diff or blur_diff:
+            raise RuntimeError(f"EdgeEngine berbeda dari pipeline B1: {edge_diff} piksel edge, "
+                               f"{blur_diff} piksel blur lingkaran")
+
+    def detect(self, frame):
+        """Sama dengan B1.detect, memakai engine ini untuk tahap edge/blur"""
+        return B1.detect(frame, self.params, engine=self)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+
+
+def benchmark(frame, runs=20, workers=None):
+    """Membandingkan latensi per frame pipeline asli B1 dengan EdgeEngine"""
+    params = B1.DetectionParams()
+    engine = EdgeEngine(params, workers, verify=True)
+    engine.process(frame)  # Alokasi buffer + verifikasi sekali
+    engine.verify = False
+
+    from benchmarks import median_ms
+
+    baseline_ms, _ = median_ms(lambda: (B1.find_edges(frame, params),
+                                        B1.blur_for_circles(frame, params)), runs)
+    engine_ms, _ = median_ms(lambda: engine.process(frame), runs)
+    engine.close()
+    return {'resolution': f'{frame.shape[1]}x{frame.shape[0]}',
+            'workers': engine.workers,
+            'baseline_ms': round(baseline_ms, 2),
+            'engine_ms': round(engine_ms, 2),
+            'speedup': round(baseline_ms / engine_ms, 2)}
+
+
+if __name__ == '__main__':
+    image = cv2.imread(B1.IMAGE_PATH)
+    for width, height in [(image.shape[1], image.shape[0]), (1280, 720), (1920, 1080)]:
+        frame = cv2.resize(image, (width, height), interpolation=cv2.INTER_LINEAR)
+        print(benchmark(frame))
@@ -0,0 +1,215 @@
+"""
+FILTER GRAPH UNTUK image_filters
+
+Setiap filter mendeklarasikan input yang dibutuhkannya (node lain di
+graph), sehingga hasil antara yang sama (grayscale, blur) dihitung SEKALI
+per gambar walaupun dipakai beberapa filter:
+
+    image -> gray -> canny_blur -> canny
+                  -> sobel
+    image -> bilateral
+
+Filter baru cukup ditambahkan lewat graph.add(nama, fungsi, input).
+
+Graph bisa dijalankan atas stream gambar / frame video (stream()): frame
+dibaca satu per satu dan hasil antara dilepas begitu tidak dibutuhkan
+lagi, sehingga memori tetap terbatas berapa pun panjang stream-nya.
+Keluaran ditulis ke direktori (headless, tanpa matplotlib).
+
+Contoh:
+    python filter_graph.py tulip.jpg --out hasil_filter
+    python filter_graph.py "frames/*.png" --filters canny sobel --out hasil
+    python filter_graph.py video.mp4 --out hasil --benchmark
+"""
+
+import argparse
+import os
+import time
+
+import cv2
+import numpy as np
+
+import image_filters
+from frame_sources import IMAGE_EXTENSIONS, VIDEO_EXTENSIONS, expand_inputs
+
+SOURCE = 'image'
+
+
+class FilterGraph:
+    def __init__(self):
+        self._nodes = {}  # nama -> (fungsi, nama input)
+
+    def add(self, name, fn, inputs=(SOURCE,)):
+        """Mendaftarkan node; fn dipanggil dengan hasil node input sesuai urutan"""
+        if name == SOURCE or name in self._nodes:
+            raise ValueError(f"Node '{name}' sudah ada")
+        for dependency in inputs:
+            if dependency != SOURCE and dependency not in self._nodes:
+                raise ValueError(f"Input '{dependency}' untuk node '{name}' belum didaftarkan")
+        self._nodes[name] = (fn, tuple(inputs))
+        return self
+
+    @property
+    def nodes(self):
+        return list(self._nodes)
+
+    def plan(self, outputs):
+        """Urutan eksekusi (topologis) hanya untuk node yang dibutuhkan outputs"""
+        order = []
+        seen = set()
+
+        def visit(name):
+            if name == SOURCE or name in seen:
+                return
+            if name not in self._nodes:
+                raise KeyError(f"Node '{name}' tidak ada di graph")
+            seen.add(name)
+            for dependency in self._nodes[name][1]:
+                visit(dependency)
+            order.append(name)
+
+        for name in outputs:
+            visit(name)
+        return order
+
+    def run(self, image, outputs=None, timings=None):
+        """
+        Menjalankan graph pada satu gambar; mengembalikan {nama: hasil} untuk
+        outputs (default: semua node). timings (dict) opsional diisi detik per node.
+        """
+        outputs = list(outputs or self._nodes)
+        order = self.plan(outputs)
+
+        # Sisa pemakaian tiap hasil; hasil antara dilepas saat mencapai nol
+        remaining = {}
+        for name in order:
+            for dependency in self._nodes[name][1]:
+                remaining[dependency] = remaining.get(dependency, 0) + 1
+
+        values = {SOURCE: image}
+        for name in order:
+            fn, inputs = self._nodes[name]
+            start = time.perf_counter()
+            values[name] = fn(*(values[dependency] for dependency in inputs))
+            if timings is not None:
+                timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+            for dependency in inputs:
+                remaining[dependency] -= 1
+                if remaining[dependency] == 0 and dependency not in outputs:
+                    del values[dependency]
+        return {name: values[name] for name in outputs}
+
+    def stream(self, frames, outputs=None, timings=None):
+        """Generator (index, hasil) atas iterable frame; satu frame di memori sekaligus"""
+        for index, frame in enumerate(frames):
+            yield index, self.run(frame, outputs, timings)
+
+
+def default_graph():
+    """Graph berisi filter image_filters dengan grayscale dan blur yang dibagi"""
+    graph = FilterGraph()
+    graph.add('gray', image_filters.to_gray)
+    graph.add('canny_blur', image_filters.canny_blur, ('gray',))
+    graph.add('canny', image_filters.canny_from_blur, ('canny_blur',))
+    graph.add('sobel', image_filters.sobel_from_gray, ('gray',))
+    graph.add('bilateral', image_filters.apply_bilateral)
+    return graph
+
+
+DEFAULT_OUTPUTS = ('canny', 'sobel', 'bilateral')
+
+
+def iter_frames(spec):
+    """
+    Frame dari gambar, glob, direktori gambar atau video; dibaca satu per
+    satu (tidak dimuat semua ke memori). Menghasilkan (nama, frame); nama
+    diawali indeks input agar a/x.jpg dan b/x.png tidak saling menimpa.
+    """
+    paths = expand_inputs(spec, IMAGE_EXTENSIONS + VIDEO_EXTENSIONS)
+    for input_index, path in enumerate(paths):
+        stem = f'{input_index:06d}_' + os.path.splitext(os.path.basename(path))[0]
+        if path.lower().endswith(IMAGE_EXTENSIONS):
+            frame = cv2.imread(path)
+            if frame is not None:
+                yield stem, frame
+            continue
+        cap = cv2.VideoCapture(path)
+        index = 0
+        try:
+            while True:
+                ok, frame = cap.read()
+                if not ok:
+                    break
+                yield f'{stem}_{index:06d}', frame
+                index += 1
+        finally:
+            cap.release()
+
+
+def write_outputs(results, out_dir, stem):
+    for name, result in results.items():
+        cv2.imwrite(os.path.join(out_dir, f'{stem}_{name}.png'), result)
+
+
+def benchmark(image, runs=10):
+    """Membandingkan tiga fungsi image_filters terpisah dengan satu run graph"""
+    graph = default_graph()
+    separate = (image_filters.apply_canny(image), image_filters.apply_sobel(image),
+                image_filters.apply_bilateral(image))
+    combined = graph.run(image, DEFAULT_OUTPUTS)
+    identical = all(np.array_equal(a, combined[name]) for a, name in zip(separate, DEFAULT_OUTPUTS))
+
+    from benchmarks import median_ms
+
+    separate_ms, _ = median_ms(lambda: (image_filters.apply_canny(image),
+                                        image_filters.apply_sobel(image),
+                                        image_filters.apply_bilateral(image)), runs)
+    graph_ms, _ = median_ms(lambda: graph.run(image, DEFAULT_OUTPUTS), runs)
+    return {'resolution': f'{image.shape[1]}x{image.shape[0]}',
+            'separate_ms': round(separate_ms, 2),
+            'graph_ms': round(graph_ms, 2),
+            'speedup': round(separate_ms / graph_ms, 2),
+            'identical': identical}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Filter graph image_filters (headless)")
+    parser.add_argument('input', nargs='?', default=image_filters.IMAGE_PATH,
+                        help="Gambar, glob, direktori gambar atau video")
+    parser.add_argument('--out', default=None, help="Direktori keluaran (default: tidak ditulis)")
+    parser.add_argument('--filters', nargs='+', default=list(DEFAULT_OUTPUTS),
+                        help="Node keluaran, mis. canny sobel bilateral gray")
+    parser.add_argument('--benchmark', action='store_true',
+                        help="Bandingkan dengan pemanggilan fungsi terpisah pada frame pertama")
+    args = parser.parse_args()
+
+    graph = default_graph()
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+
+    timings = {}
+    frames = 0
+    first = None
+    start = time.perf_counter()
+    for stem, frame in iter_frames(args.input):
+        results = graph.run(frame, args.filters, timings)
+        if args.out:
+            write_outputs(results, args.out, stem)
+        if first is None and args.benchmark:
+            first = frame
+        frames += 1
+    elapsed = time.perf_counter() - start
+
+    if not frames:
+        print(f"Tidak ada frame dari {args.input}")
+        return
+    print(f"{frames} frame dalam {elapsed:.2f} s ({frames / elapsed:.1f} frame/detik)")
+    for name, seconds in timings.items():
+        print(f"  {name:<11} rata-rata {1000 * seconds / frames:.2f} ms")
+    if first is not None:
+        print(benchmark(first))
+        print(image_filters.benchmark_sobel(first))
+
+
+if __name__ == '__main__':
+    main()
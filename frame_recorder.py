@@ -0,0 +1,206 @@
+"""
+PEREKAM FRAME UNTUK LELA CAMERA STREAMING SERVER
+
+- FrameRingBuffer : ring buffer di memori berisi chunk JPEG yang sudah
+                    ter-encode beserta timestamp capture. Ukurannya dibatasi
+                    dalam BYTES (bukan jumlah frame), frame tertua dibuang
+                    otomatis. Dipakai untuk /replay?seconds=N.
+- SegmentWriter   : thread latar yang menyalin frame ke file segmen di disk.
+                    File segmen dialokasikan di awal dan ditulis lewat mmap;
+                    isinya adalah stream multipart MJPEG yang bisa diputar
+                    ulang apa adanya, ditemani file .idx (timestamp offset
+                    panjang per baris).
+
+Keduanya tidak pernah memblokir loop capture: ring buffer hanya memegang
+lock sebentar untuk append O(1), dan SegmentWriter memakai antrian
+terbatas dengan put_nowait (frame di-drop dan dihitung jika disk tertinggal).
+"""
+
+import collections
+import mmap
+import os
+import queue
+import threading
+import time
+
+
+class FrameRingBuffer:
+    """Ring buffer frame ter-encode yang dibatasi total bytes"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._frames = collections.deque()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.frames_evicted = 0
+
+    def append(self, timestamp, chunk):
+        with self._lock:
+            self._frames.append((timestamp, chunk))
+            self.total_bytes += len(chunk)
+            while self.total_bytes > self.max_bytes and len(self._frames) > 1:
+                _, old = self._frames.popleft()
+                self.total_bytes -= len(old)
+                self.frames_evicted += 1
+
+    def frames_since(self, seconds):
+        """Salinan daftar (timestamp, chunk) untuk `seconds` detik terakhir"""
+        with self._lock:
+            if not self._frames:
+                return []
+            cutoff = self._frames[-1][0] - seconds
+            frames = []
+            for item in reversed(self._frames):
+                if item[0] < cutoff:
+                    break
+                frames.append(item)
+        frames.reverse()
+        return frames
+
+    def replay_schedule(self, seconds):
+        """Daftar (offset detik dari frame pertama, chunk) untuk replay real-time"""
+        frames = self.frames_since(seconds)
+        if not frames:
+            return []
+        start = frames[0][0]
+        return [(timestamp - start, chunk) for timestamp, chunk in frames]
+
+    def status(self):
+        with self._lock:
+            count = len(self._frames)
+            span = self._frames[-1][0] - self._frames[0][0] if count > 1 else 0.0
+        return {
+            'frames': count,
+            'bytes': self.total_bytes,
+            'max_bytes': self.max_bytes,
+            'seconds': round(span, 2),
+            'frames_evicted': self.frames_evicted,
+        }
+
+
+class SegmentWriter:
+    """Menulis frame ke file segmen yang dialokasikan di awal, lewat mmap"""
+
+    def __init__(self, directory, segment_bytes=256 * 1024 * 1024, max_segments=8,
+                 queue_frames=256):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.max_segments = max_segments
+        self._queue = queue.Queue(maxsize=queue_frames)
+        self._segment_index = 0
+        self._segments = collections.deque()
+        self._file = None
+        self._map = None
+        self._index_file = None
+        self._offset = 0
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self.bytes_written = 0
+        os.makedirs(directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._write_loop, daemon=True)
+        self._thread.start()
+
+    def submit(self, timestamp, chunk):
+        """Menitipkan frame untuk ditulis; tidak pernah memblokir pemanggil"""
+        try:
+            self._queue.put_nowait((timestamp, chunk))
+        except queue.Full:
+            self.frames_dropped += 1
+
+    def close(self):
+        """Menulis sisa antrean lalu memotong segmen aktif ke ukuran terpakai; idempoten"""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def _open_segment(self):
+        self._segment_index += 1
+        base = os.path.join(self.directory, f'segment_{int(time.time())}_{self._segment_index:05d}')
+        self._file = open(base + '.mjpeg', 'w+b')
+        # Alokasikan ruang segmen di awal agar penulisan tidak menambah ukuran file
+        try:
+            os.posix_fallocate(self._file.fileno(), 0, self.segment_bytes)
+        except (AttributeError, OSError):
+            # Windows / filesystem tanpa fallocate
+            self._file.truncate(self.segment_bytes)
+        self._map = mmap.mmap(self._file.fileno(), self.segment_bytes)
+        # Line-buffered: setiap entri indeks langsung sampai ke file
+        self._index_file = open(base + '.idx', 'w', buffering=1)
+        self._offset = 0
+        self._segments.append(base)
+
+        while len(self._segments) > self.max_segments:
+            old = self._segments.popleft()
+            for ext in ('.mjpeg', '.idx'):
+                try:
+                    os.remove(old + ext)
+                except OSError:
+                    pass
+
+    def _close_segment(self):
+        if self._file is None:
+            return
+        self._map.flush()
+        self._map.close()
+        # Potong sisa ruang yang tidak terpakai
+        self._file.truncate(self._offset)
+        self._file.close()
+        self._index_file.close()
+        self._file = self._map = self._index_file = None
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            timestamp, chunk = item
+            size = len(chunk)
+            if size > self.segment_bytes:
+                self.frames_dropped += 1
+                continue
+            if self._file is None or self._offset + size > self.segment_bytes:
+                self._close_segment()
+                self._open_segment()
+
+            self._map[self._offset:self._offset + size] = chunk
+            self._index_file.write(f'{timestamp:.6f} {self._offset} {size}\n')
+            self._offset += size
+            self.frames_written += 1
+            self.bytes_written += size
+
+        self._close_segment()
+
+    def status(self):
+        return {
+            'directory': self.directory,
+            'segments': len(self._segments),
+            'frames_written': self.frames_written,
+            'frames_dropped': self.frames_dropped,
+            'bytes_written': self.bytes_written,
+            'queue_depth': self._queue.qsize(),
+        }
+
+
+class FrameRecorder:
+    """Menggabungkan ring buffer di memori dan (opsional) penulis segmen di disk"""
+
+    def __init__(self, max_bytes, spill_directory=None, segment_bytes=256 * 1024 * 1024):
+        self.ring = FrameRingBuffer(max_bytes)
+        self.writer = SegmentWriter(spill_directory, segment_bytes) if spill_directory else None
+
+    def record(self, timestamp, chunk):
+        self.ring.append(timestamp, chunk)
+        if self.writer is not None:
+            self.writer.submit(timestamp, chunk)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+    def status(self):
+        return {
+            'ring': self.ring.status(),
+            'spill': self.writer.status() if self.writer else None,
+        }
@@ -0,0 +1,209 @@
+"""
+SUMBER FRAME UNTUK LELA CAMERA STREAMING SERVER
+
+Abstraksi sumber frame dengan antarmuka yang sama seperti cv2.VideoCapture
+(read, isOpened, release), sehingga server bisa dijalankan dan di-benchmark
+tanpa webcam fisik:
+
+- WebcamSource     : kamera (cv2.VideoCapture), perilaku lama server
+- FileReplaySource : replay file video / gambar / urutan gambar secara loop
+                     pada FPS tertentu; semua frame di-decode di awal ke
+                     memori agar biaya decode tidak ikut terukur
+- SyntheticSource  : pola sintetis bergerak pada resolusi berapa pun
+
+Spesifikasi sumber (create_frame_source):
+    webcam            kamera default (CAMERA_INDEX)
+    webcam:1          kamera dengan index 1
+    file:tulip.jpg    replay satu gambar / video / glob / direktori gambar
+    synthetic         pola sintetis
+"""
+
+import glob
+import os
+import time
+
+import cv2
+import numpy as np
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff')
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv', '.webm', '.mjpeg')
+
+
+def expand_inputs(inputs, extensions=IMAGE_EXTENSIONS):
+    """
+    Direktori, glob atau path berkas -> daftar berkas (urut, unik); dipakai
+    semua CLI agar masukan yang diterima sama. Isi direktori dan hasil glob
+    disaring dengan extensions; path berkas yang disebut langsung selalu
+    disertakan. inputs boleh satu string atau daftar.
+    """
+    if isinstance(inputs, str):
+        inputs = [inputs]
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            candidates = glob.glob(os.path.join(item, '*'))
+        elif any(ch in item for ch in '*?['):
+            candidates = glob.glob(item, recursive=True)
+        else:
+            paths.append(item)
+            continue
+        paths.extend(p for p in sorted(candidates) if p.lower().endswith(extensions))
+    return list(dict.fromkeys(paths))
+
+
+class FramePacer:
+    """Menjaga laju frame tetap pada FPS target (0 = secepat mungkin)"""
+
+    def __init__(self, fps):
+        self.interval = 1.0 / fps if fps and fps > 0 else 0.0
+        self._next = None
+
+    def wait(self):
+        if self.interval == 0.0:
+            return
+        now = time.perf_counter()
+        if self._next is None or now - self._next > self.interval:
+            # Awal stream atau tertinggal jauh: mulai jadwal baru
+            self._next = now
+        elif self._next > now:
+            time.sleep(self._next - now)
+        self._next += self.interval
+
+
+class WebcamSource:
+    """Kamera fisik lewat cv2.VideoCapture"""
+
+    def __init__(self, index=0, width=640, height=480, fps=30):
+        self.capture = cv2.VideoCapture(index)
+        self.capture.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        self.capture.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        self.capture.set(cv2.CAP_PROP_FPS, fps)
+        # Buffer kecil untuk mengurangi latensi
+        self.capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+    def read(self):
+        return self.capture.read()
+
+    def isOpened(self):
+        return self.capture.isOpened()
+
+    def release(self):
+        self.capture.release()
+
+
+class FileReplaySource:
+    """
+    Replay file video atau gambar secara loop pada FPS tertentu.
+
+    Semua frame di-decode (dan di-resize ke width x height jika diberikan)
+    saat inisialisasi. Frame yang dikembalikan read() bersifat read-only dan
+    dipakai ulang; salin dulu jika ingin menggambar di atasnya.
+    """
+
+    def __init__(self, path, width=None, height=None, fps=30, max_frames=None):
+        self.frames = []
+        for file_path in expand_inputs(path, IMAGE_EXTENSIONS + VIDEO_EXTENSIONS):
+            if file_path.lower().endswith(IMAGE_EXTENSIONS):
+                frame = cv2.imread(file_path)
+                if frame is not None:
+                    self.frames.append(self._prepare(frame, width, height))
+            else:
+                capture = cv2.VideoCapture(file_path)
+                while max_frames is None or len(self.frames) < max_frames:
+                    ok, frame = capture.read()
+                    if not ok:
+                        break
+                    self.frames.append(self._prepare(frame, width, height))
+                capture.release()
+            if max_frames is not None and len(self.frames) >= max_frames:
+                break
+
+        self._index = 0
+        self._pacer = FramePacer(fps)
+
+    @staticmethod
+    def _prepare(frame, width, height):
+        if width and height and (frame.shape[1], frame.shape[0]) != (width, height):
+            frame = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+        frame.flags.writeable = False
+        return frame
+
+    @property
+    def memory_bytes(self):
+        return sum(frame.nbytes for frame in self.frames)
+
+    def read(self):
+        if not self.frames:
+            return False, None
+        self._pacer.wait()
+        frame = self.frames[self._index]
+        self._index = (self._index + 1) % len(self.frames)
+        return True, frame
+
+    def isOpened(self):
+        return bool(self.frames)
+
+    def release(self):
+        self.frames = []
+
+
+class SyntheticSource:
+    """
+    Pola sintetis bergerak (gradien, kotak-kotak dan noise) tanpa hardware.
+
+    Pola dibuat sekali dengan lebar ekstra; setiap frame adalah jendela yang
+    bergeser di atas pola tersebut (view, tanpa alokasi), sehingga biaya
+    pembuatan frame mendekati nol dan yang terukur murni encode + fan-out.
+    """
+
+    SHIFT_PER_FRAME = 8
+
+    def __init__(self, width=640, height=480, fps=30, seed=0):
+        self.width = width
+        self.height = height
+        self._period = 256
+        self._pattern = self._make_pattern(width + self._period, height, seed)
+        self._offset = 0
+        self._pacer = FramePacer(fps)
+
+    @staticmethod
+    def _make_pattern(width, height, seed):
+        rng = np.random.default_rng(seed)
+        # int32: x * 255 meluap di uint16 untuk x >= 258 (gradien jadi gigi gergaji)
+        x = np.arange(width, dtype=np.int32)
+        y = np.arange(height, dtype=np.int32)[:, None]
+
+        pattern = np.empty((height, width, 3), np.uint8)
+        pattern[:, :, 0] = (x * 255 // max(width - 1, 1)).astype(np.uint8)
+        pattern[:, :, 1] = (y * 255 // max(height - 1, 1)).astype(np.uint8)
+        pattern[:, :, 2] = (((x // 32) + (y // 32)) % 2 * 200).astype(np.uint8)
+
+        # Sedikit noise agar ukuran JPEG mendekati gambar kamera sungguhan
+        noise = rng.integers(0, 12, size=pattern.shape, dtype=np.uint8)
+        cv2.add(pattern, noise, dst=pattern)
+        pattern.flags.writeable = False
+        return pattern
+
+    def read(self):
+        self._pacer.wait()
+        frame = self._pattern[:, self._offset:self._offset + self.width]
+        self._offset = (self._offset + self.SHIFT_PER_FRAME) % self._period
+        return True, frame
+
+    def isOpened(self):
+        return True
+
+    def release(self):
+        pass
+
+
+def create_frame_source(spec, width=640, height=480, fps=30):
+    """Membuat sumber frame dari string spesifikasi (lihat docstring modul)"""
+    kind, _, arg = spec.partition(':')
+    if kind == 'webcam':
+        return WebcamSource(int(arg) if arg else 0, width, height, fps)
+    if kind == 'file':
+        return FileReplaySource(arg, width, height, fps)
+    if kind == 'synthetic':
+        return SyntheticSource(width, height, fps)
+    raise ValueError(f"Sumber frame tidak dikenal: {spec}")
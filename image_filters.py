@@ -1,6 +1,7 @@
 import cv2
 import numpy as np
-import matplotlib.pyplot as plt
+
+from stage_trace import stage, traced
 
 IMAGE_PATH = "tulip.jpg"
 
@@ -17,25 +18,142 @@ def load_image(path):
         print(f"Error memuat gambar: {e}")
         return None
 
-def apply_canny(image):
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    blurred = cv2.GaussianBlur(gray, (5, 5), 1.4)
-    edges = cv2.Canny(blurred, 100, 200)
-    return edges
-
-def apply_sobel(image):
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    sobelx = cv2.Sobel(gray, cv2.CV_64F, 1, 0, ksize=3)
-    sobely = cv2.Sobel(gray, cv2.CV_64F, 0, 1, ksize=3)
-    magnitude = np.sqrt(sobelx**2 + sobely**2)
-    magnitude = np.uint8(magnitude / magnitude.max() * 255)
+@traced('image_filters.to_gray')
+def to_gray(image):
+    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+@traced('image_filters.canny_blur')
+def canny_blur(gray):
+    return cv2.GaussianBlur(gray, (5, 5), 1.4)
+
+@traced('image_filters.canny_from_blur')
+def canny_from_blur(blurred):
+    return cv2.Canny(blurred, 100, 200)
+
+@traced('image_filters.sobel_from_gray')
+def sobel_from_gray(gray):
+    with stage('image_filters.sobel_gradients', gray.nbytes):
+        sobelx = cv2.Sobel(gray, cv2.CV_64F, 1, 0, ksize=3)
+        sobely = cv2.Sobel(gray, cv2.CV_64F, 0, 1, ksize=3)
+    with stage('image_filters.sobel_magnitude', sobelx.nbytes + sobely.nbytes):
+        magnitude = np.sqrt(sobelx**2 + sobely**2)
+        magnitude = np.uint8(magnitude / magnitude.max() * 255)
     return magnitude
 
+class SobelWorkspace:
+    """
+    Buffer float32 (gx, gy, magnitude) dan uint8 keluaran yang dipakai ulang
+    antar panggilan sobel_from_gray_fast. Hasil yang dikembalikan adalah
+    buffer milik workspace: isinya tertimpa pada panggilan berikutnya.
+    """
+
+    def __init__(self):
+        self.shape = None
+
+    def ensure(self, shape):
+        if shape != self.shape:
+            self.gx = np.empty(shape, np.float32)
+            self.gy = np.empty(shape, np.float32)
+            self.magnitude = np.empty(shape, np.float32)
+            self.out = np.empty(shape, np.uint8)
+            self.shape = shape
+        return self
+
+# Selisih maksimum mode cepat (L2) terhadap sobel_from_gray float64: hanya
+# pembulatan float32 yang bisa menggeser pemotongan ke uint8 satu tingkat
+SOBEL_FAST_MAX_ERROR = 1
+
+@traced('image_filters.sobel_from_gray_fast')
+def sobel_from_gray_fast(gray, workspace=None, l1=False):
+    """
+    Magnitudo Sobel float32 tanpa alokasi baru (jika workspace dipakai ulang).
+    l1=True memakai |gx| + |gy| (lebih murah, bukan magnitudo Euclid; hasil
+    berbeda dari mode float64 dan tidak terikat SOBEL_FAST_MAX_ERROR).
+    """
+    ws = (workspace or SobelWorkspace()).ensure(gray.shape)
+    with stage('image_filters.sobel_gradients', gray.nbytes):
+        cv2.Sobel(gray, cv2.CV_32F, 1, 0, dst=ws.gx, ksize=3)
+        cv2.Sobel(gray, cv2.CV_32F, 0, 1, dst=ws.gy, ksize=3)
+    with stage('image_filters.sobel_magnitude', ws.gx.nbytes + ws.gy.nbytes):
+        if l1:
+            np.abs(ws.gx, out=ws.gx)
+            np.abs(ws.gy, out=ws.gy)
+            cv2.add(ws.gx, ws.gy, dst=ws.magnitude)
+        else:
+            cv2.magnitude(ws.gx, ws.gy, magnitude=ws.magnitude)
+
+    peak = float(ws.magnitude.max())
+    if peak == 0:
+        ws.out.fill(0)
+        return ws.out
+    # Urutan operasi sama dengan mode float64: bagi max, kali 255, potong ke uint8
+    np.divide(ws.magnitude, peak, out=ws.magnitude)
+    np.multiply(ws.magnitude, 255, out=ws.magnitude)
+    np.copyto(ws.out, ws.magnitude, casting='unsafe')
+    return ws.out
+
+@traced('image_filters.apply_canny')
+def apply_canny(image):
+    return canny_from_blur(canny_blur(to_gray(image)))
+
+@traced('image_filters.apply_sobel')
+def apply_sobel(image, fast=False, workspace=None, l1=False):
+    gray = to_gray(image)
+    if fast or l1:
+        return sobel_from_gray_fast(gray, workspace, l1)
+    return sobel_from_gray(gray)
+
+def sobel_max_error(image, l1=False):
+    """
+    Selisih absolut maksimum mode cepat terhadap apply_sobel float64
+
+    >>> rng = np.random.default_rng(0)
+    >>> frame = rng.integers(0, 256, (120, 160, 3), dtype=np.uint8)
+    >>> sobel_max_error(frame) <= SOBEL_FAST_MAX_ERROR
+    True
+    """
+    reference = apply_sobel(image)
+    fast = apply_sobel(image, fast=True, l1=l1)
+    return int(np.abs(reference.astype(np.int16) - fast.astype(np.int16)).max())
+
+def benchmark_sobel(image, runs=20):
+    """Runtime dan puncak alokasi memori (tracemalloc) mode float64 vs cepat"""
+    import tracemalloc
+
+    from benchmarks import median_ms
+
+    gray = to_gray(image)
+    workspace = SobelWorkspace().ensure(gray.shape)
+    modes = {
+        'float64': lambda: sobel_from_gray(gray),
+        'fast_l2': lambda: sobel_from_gray_fast(gray, workspace),
+        'fast_l1': lambda: sobel_from_gray_fast(gray, workspace, l1=True),
+    }
+
+    report = {'resolution': f'{gray.shape[1]}x{gray.shape[0]}'}
+    for name, fn in modes.items():
+        fn()
+        tracemalloc.start()
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        ms, _ = median_ms(fn, runs)
+        report[name] = {'ms': round(ms, 3),
+                        'peak_bytes_per_pixel': round(peak / gray.size, 2)}
+    report['max_error_l2'] = sobel_max_error(image)
+    report['max_error_l1'] = sobel_max_error(image, l1=True)
+    return report
+
+@traced('image_filters.apply_bilateral')
 def apply_bilateral(image):
     bilateral = cv2.bilateralFilter(image, d=9, sigmaColor=75, sigmaSpace=75)
     return bilateral
 
 def main():
+    # Hanya tampilan interaktif yang butuh matplotlib; mode batch tetap headless
+    import matplotlib.pyplot as plt
+
     print("="*70)
     print("PROGRAM IMAGE FILTERING")
     print("="*70)
@@ -0,0 +1,155 @@
+"""
+TAHAP ENCODE JPEG UNTUK LELA CAMERA STREAMING SERVER
+
+Encode frame ke JPEG dan membungkusnya menjadi chunk multipart dengan
+sesedikit mungkin salinan:
+
+- Parameter encode di-cache per kualitas (tidak dibangun ulang tiap frame)
+- Header dan footer multipart dibuat sekali; chunk dirakit dengan satu
+  b''.join atas memoryview buffer hasil encode (satu salinan, bukan
+  tobytes() + dua kali konkatenasi)
+- Backend encoder alternatif (PyTurboJPEG, Pillow / Pillow-SIMD) dipakai
+  jika terpasang; pilihan 'auto' menjalankan benchmark singkat saat start
+  dan memakai encoder tercepat
+- EncodeStats melaporkan frame per detik per core (frame / CPU-detik encode)
+"""
+
+import io
+import time
+
+import cv2
+import numpy as np
+
+MULTIPART_PREFIX = b'--frame\r\nContent-Type: image/jpeg\r\n'
+MULTIPART_SUFFIX = b'\r\n'
+
+
+class OpenCVEncoder:
+    """Encoder bawaan dengan cv2.imencode"""
+
+    name = 'opencv'
+
+    def __init__(self):
+        self._quality = None
+        self._params = None
+
+    def encode(self, frame, quality):
+        if quality != self._quality:
+            self._quality = quality
+            self._params = [int(cv2.IMWRITE_JPEG_QUALITY), quality]
+        ret, buffer = cv2.imencode('.jpg', frame, self._params)
+        return memoryview(buffer) if ret else None
+
+
+class TurboJPEGEncoder:
+    """Encoder libjpeg-turbo lewat PyTurboJPEG (opsional)"""
+
+    name = 'turbojpeg'
+
+    def __init__(self):
+        from turbojpeg import TurboJPEG
+        self._jpeg = TurboJPEG()
+
+    def encode(self, frame, quality):
+        # Default pixel format PyTurboJPEG adalah BGR, sama dengan OpenCV
+        return memoryview(self._jpeg.encode(np.ascontiguousarray(frame), quality=quality))
+
+
+class PillowEncoder:
+    """Encoder Pillow / Pillow-SIMD (opsional)"""
+
+    name = 'pillow'
+
+    def __init__(self):
+        from PIL import Image
+        self._image = Image
+
+    def encode(self, frame, quality):
+        frame = np.ascontiguousarray(frame)
+        height, width = frame.shape[:2]
+        image = self._image.frombuffer('RGB', (width, height), frame, 'raw', 'BGR', 0, 1)
+        output = io.BytesIO()
+        image.save(output, format='JPEG', quality=quality)
+        return output.getbuffer()
+
+
+ENCODER_CLASSES = {
+    'opencv': OpenCVEncoder,
+    'turbojpeg': TurboJPEGEncoder,
+    'pillow': PillowEncoder,
+}
+
+
+def available_encoders():
+    """Mengembalikan encoder yang bisa dibuat di lingkungan ini"""
+    encoders = []
+    for cls in ENCODER_CLASSES.values():
+        try:
+            encoders.append(cls())
+        except Exception:
+            # Library opsional tidak terpasang atau gagal dimuat
+            continue
+    return encoders
+
+
+def benchmark_encoder(encoder, frame, quality, duration=0.3):
+    """Frame per detik encoder pada frame contoh selama kira-kira duration detik"""
+    encoder.encode(frame, quality)  # Pemanasan
+    count = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < duration:
+        encoder.encode(frame, quality)
+        count += 1
+        elapsed = time.perf_counter() - start
+    return count / elapsed
+
+
+def create_encoder(name, sample_frame=None, quality=70, duration=0.3):
+    """
+    Membuat encoder berdasarkan nama. 'auto' mem-benchmark semua encoder yang
+    tersedia pada sample_frame dan mengembalikan yang tercepat.
+    """
+    if name != 'auto':
+        return ENCODER_CLASSES[name]()
+    if sample_frame is None:
+        return OpenCVEncoder()
+
+    results = [(benchmark_encoder(encoder, sample_frame, quality, duration), encoder)
+               for encoder in available_encoders()]
+    best_fps, best = max(results, key=lambda item: item[0])
+    best.benchmark = {encoder.name: round(fps, 1) for fps, encoder in results}
+    return best
+
+
+def build_chunk(jpeg, captured_at):
+    """Merakit chunk multipart (satu salinan) dari buffer JPEG dan waktu capture"""
+    return b''.join((MULTIPART_PREFIX,
+                     b'X-Timestamp: %.6f\r\n\r\n' % captured_at,
+                     jpeg,
+                     MULTIPART_SUFFIX))
+
+
+class EncodeStats:
+    """Throughput encode: frame per detik wall-clock dan per CPU-detik (per core)"""
+
+    def __init__(self):
+        self.frames = 0
+        self.cpu_seconds = 0.0
+        self.wall_seconds = 0.0
+
+    def record(self, cpu_seconds, wall_seconds):
+        self.frames += 1
+        self.cpu_seconds += cpu_seconds
+        self.wall_seconds += wall_seconds
+
+    @property
+    def fps_per_core(self):
+        return self.frames / self.cpu_seconds if self.cpu_seconds > 0 else 0.0
+
+    def status(self):
+        return {
+            'frames': self.frames,
+            'fps_per_core': round(self.fps_per_core, 1),
+            'avg_encode_ms': round(1000 * self.wall_seconds / self.frames, 3) if self.frames else None,
+        }
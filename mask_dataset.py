@@ -0,0 +1,296 @@
+"""
+DATASET BINARY MASK SKALA DIREKTORI
+
+Mengubah seluruh sesi capture menjadi binary mask (semantik sama dengan
+binary_mask.create_binary_mask: gray > threshold -> 0, selainnya -> 255)
+untuk data training:
+
+- Threshold lewat LUT 256 entri (cv2.LUT) langsung ke bit 0/1, beberapa
+  threshold sekaligus dari satu decode + satu konversi gray
+- Opsi --direct-gray: decode langsung ke grayscale (IMREAD_GRAYSCALE),
+  lebih cepat tetapi konversi gray dari decoder BERBEDA dari cvtColor
+  (terukur hingga 14 level pada PNG contoh), jadi mask tidak identik
+- Semua mask di-bitpack (np.packbits) ke SATU berkas masks.bin. Ukuran
+  gambar dibaca dari header (Pillow, opsional) sehingga offset setiap mask
+  diketahui di awal; berkas dialokasikan sekali lalu setiap worker menulis
+  bagiannya sendiri lewat np.memmap (data mask tidak lewat pipe antar proses)
+- index.npy (array terstruktur) + files.json menjelaskan isi dataset;
+  MaskDataset membacanya kembali lewat memmap
+
+Contoh:
+    python mask_dataset.py captures/ --thresholds 60 127 --out masks_ds --workers 4
+    python mask_dataset.py "session_*/*.png" --out masks_ds --benchmark
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+import numpy as np
+
+import binary_mask
+from frame_sources import expand_inputs
+
+try:
+    from PIL import Image
+except ImportError:  # Tanpa Pillow ukuran gambar dibaca lewat decode penuh
+    Image = None
+
+DATA_FILE = 'masks.bin'
+INDEX_FILE = 'index.npy'
+FILES_FILE = 'files.json'
+
+INDEX_DTYPE = np.dtype([
+    ('file_id', np.int32),
+    ('threshold', np.int16),
+    ('ok', np.bool_),
+    ('height', np.int32),
+    ('width', np.int32),
+    ('offset', np.int64),
+    ('nbytes', np.int64),
+])
+
+
+def threshold_lut(threshold_value):
+    """
+    LUT 256 entri: 1 jika piksel masuk mask (gray <= threshold), 0 jika tidak
+
+    >>> threshold_lut(60)[[0, 60, 61, 255]].tolist()
+    [1, 1, 0, 0]
+    """
+    return (np.arange(256) <= threshold_value).astype(np.uint8)
+
+
+# Tag EXIF Orientation; nilai 5-8 berarti gambar diputar 90 derajat
+EXIF_ORIENTATION = 0x0112
+TRANSPOSED_ORIENTATIONS = (5, 6, 7, 8)
+
+
+def image_size(path):
+    """
+    (height, width) seperti hasil cv2.imread (orientasi EXIF diterapkan)
+    dari header berkas; None jika tidak bisa dibaca
+    """
+    if Image is not None:
+        # Hanya header yang dibaca: batas decompression bomb Pillow tidak
+        # relevan dan akan menolak ortomosaik besar
+        max_pixels, Image.MAX_IMAGE_PIXELS = Image.MAX_IMAGE_PIXELS, None
+        try:
+            with Image.open(path) as img:
+                width, height = img.size
+                orientation = img.getexif().get(EXIF_ORIENTATION, 1)
+        except OSError:
+            return None
+        finally:
+            Image.MAX_IMAGE_PIXELS = max_pixels
+        if orientation in TRANSPOSED_ORIENTATIONS:
+            width, height = height, width
+        return height, width
+    # Mode default (bukan IMREAD_UNCHANGED) agar orientasi EXIF sama dengan worker
+    img = cv2.imread(path)
+    return None if img is None else img.shape[:2]
+
+
+def packed_nbytes(height, width):
+    return (height * width + 7) // 8
+
+
+def unpack_mask(packed, height, width):
+    """Bit 0/1 hasil packbits -> mask uint8 0/255 seperti create_binary_mask"""
+    bits = np.unpackbits(packed, count=height * width)
+    return (bits.reshape(height, width) * 255).astype(np.uint8)
+
+
+# State per proses worker
+_worker_data = None
+_worker_luts = None
+
+
+def _init_worker(data_path, total_bytes, thresholds):
+    global _worker_data, _worker_luts
+    cv2.setNumThreads(1)
+    _worker_data = np.memmap(data_path, dtype=np.uint8, mode='r+', shape=(total_bytes,))
+    _worker_luts = [threshold_lut(t) for t in thresholds]
+
+
+def _mask_file(task):
+    """Dijalankan di worker: decode, gray, LUT per threshold, packbits ke memmap"""
+    path, height, width, offsets, direct_gray = task
+    if direct_gray:
+        gray = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+    else:
+        image = cv2.imread(path)
+        gray = None if image is None else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    if gray is None or gray.shape != (height, width):
+        return False
+
+    nbytes = packed_nbytes(height, width)
+    for lut, offset in zip(_worker_luts, offsets):
+        bits = cv2.LUT(gray, lut)
+        _worker_data[offset:offset + nbytes] = np.packbits(bits, axis=None)
+    return True
+
+
+def build_dataset(paths, out_dir, thresholds, workers=None, direct_gray=False, chunksize=4):
+    """Membuat dataset mask di out_dir; mengembalikan ringkasan"""
+    os.makedirs(out_dir, exist_ok=True)
+    start = time.perf_counter()
+
+    files, entries, tasks = [], [], []
+    offset = 0
+    for path in paths:
+        size = image_size(path)
+        if size is None:
+            continue
+        height, width = size
+        file_id = len(files)
+        files.append(path)
+        nbytes = packed_nbytes(height, width)
+        offsets = []
+        for threshold in thresholds:
+            entries.append((file_id, threshold, False, height, width, offset, nbytes))
+            offsets.append(offset)
+            offset += nbytes
+        tasks.append((path, height, width, offsets, direct_gray))
+
+    data_path = os.path.join(out_dir, DATA_FILE)
+    with open(data_path, 'wb') as f:
+        f.truncate(offset)  # Dialokasikan sekali; worker menulis lewat memmap
+
+    index = np.array(entries, dtype=INDEX_DTYPE)
+    if tasks and offset:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(data_path, offset, tuple(thresholds))) as pool:
+            ok = list(pool.map(_mask_file, tasks, chunksize=chunksize))
+        # Entri tersusun per berkas, satu per threshold
+        index['ok'] = np.repeat(ok, len(thresholds))
+
+    np.save(os.path.join(out_dir, INDEX_FILE), index)
+    with open(os.path.join(out_dir, FILES_FILE), 'w') as f:
+        json.dump({'files': files, 'thresholds': list(thresholds),
+                   'direct_gray': direct_gray}, f, indent=2)
+    elapsed = time.perf_counter() - start
+
+    masks = int(index['ok'].sum())
+    return {
+        'images': len(files),
+        'skipped': len(paths) - len(files),
+        'masks': masks,
+        'failed': len(index) - masks,
+        'seconds': round(elapsed, 3),
+        'masks_per_second': round(masks / elapsed, 2) if elapsed else 0.0,
+        'bytes_on_disk': dataset_bytes(out_dir),
+    }
+
+
+def dataset_bytes(out_dir):
+    return sum(os.path.getsize(os.path.join(out_dir, name))
+               for name in (DATA_FILE, INDEX_FILE, FILES_FILE))
+
+
+class MaskDataset:
+    """Pembaca dataset: mask di-unpack dari memmap saat diakses"""
+
+    def __init__(self, out_dir):
+        self.index = np.load(os.path.join(out_dir, INDEX_FILE))
+        with open(os.path.join(out_dir, FILES_FILE)) as f:
+            meta = json.load(f)
+        self.files = meta['files']
+        self.thresholds = meta['thresholds']
+        data_path = os.path.join(out_dir, DATA_FILE)
+        self._data = (np.memmap(data_path, dtype=np.uint8, mode='r')
+                      if os.path.getsize(data_path) else np.empty(0, np.uint8))
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getitem__(self, i):
+        entry = self.index[i]
+        packed = self._data[entry['offset']:entry['offset'] + entry['nbytes']]
+        return unpack_mask(packed, int(entry['height']), int(entry['width']))
+
+    def mask(self, path, threshold):
+        file_id = self.files.index(path)
+        matches = np.flatnonzero((self.index['file_id'] == file_id)
+                                 & (self.index['threshold'] == threshold))
+        if not len(matches):
+            raise KeyError((path, threshold))
+        return self[int(matches[0])]
+
+
+def write_png_masks(paths, out_dir, thresholds):
+    """Pembanding: satu PNG per mask lewat create_binary_mask (satu proses)"""
+    os.makedirs(out_dir, exist_ok=True)
+    start = time.perf_counter()
+    masks = 0
+    for file_id, path in enumerate(paths):
+        image = cv2.imread(path)
+        if image is None:
+            continue
+        for threshold in thresholds:
+            mask = binary_mask.create_binary_mask(image, threshold)
+            cv2.imwrite(os.path.join(out_dir, f'{file_id:06d}_{threshold}.png'), mask)
+            masks += 1
+    elapsed = time.perf_counter() - start
+    size = sum(entry.stat().st_size for entry in os.scandir(out_dir))
+    return {'masks': masks, 'seconds': round(elapsed, 3),
+            'masks_per_second': round(masks / elapsed, 2) if elapsed else 0.0,
+            'bytes_on_disk': size}
+
+
+def verify(out_dir, samples=5):
+    """Jumlah piksel berbeda dari create_binary_mask pada beberapa mask pertama"""
+    dataset = MaskDataset(out_dir)
+    differing = 0
+    for entry in dataset.index[:samples]:
+        if not entry['ok']:
+            continue
+        image = cv2.imread(dataset.files[entry['file_id']])
+        expected = binary_mask.create_binary_mask(image, int(entry['threshold']))
+        differing += int(np.count_nonzero(dataset.mask(dataset.files[entry['file_id']],
+                                                       int(entry['threshold'])) != expected))
+    return differing
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dataset binary mask bitpacked + memmap")
+    parser.add_argument('inputs', nargs='+', help="Direktori, glob atau berkas gambar")
+    parser.add_argument('--out', required=True, help="Direktori dataset keluaran")
+    parser.add_argument('--thresholds', type=int, nargs='+', default=[127])
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--direct-gray', action='store_true',
+                        help="Decode langsung ke grayscale (lebih cepat, tidak identik)")
+    parser.add_argument('--benchmark', action='store_true',
+                        help="Bandingkan dengan satu PNG per mask")
+    args = parser.parse_args()
+
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        print("Tidak ada berkas gambar yang cocok", file=sys.stderr)
+        return 1
+
+    summary = build_dataset(paths, args.out, args.thresholds, args.workers, args.direct_gray)
+    print(f"Dataset: {summary}")
+    if not args.direct_gray:
+        print(f"Piksel berbeda dari create_binary_mask (sampel): {verify(args.out)}")
+
+    if args.benchmark:
+        png_dir = tempfile.mkdtemp(prefix='masks_png_')
+        try:
+            png = write_png_masks(paths, png_dir, args.thresholds)
+        finally:
+            shutil.rmtree(png_dir, ignore_errors=True)
+        print(f"PNG per berkas: {png}")
+        print(f"Rasio ukuran disk (dataset / PNG): "
+              f"{summary['bytes_on_disk'] / max(png['bytes_on_disk'], 1):.2f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
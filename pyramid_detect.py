@@ -0,0 +1,170 @@
+"""
+MODE PIRAMIDA (COARSE-TO-FINE) UNTUK DETEKSI B1
+
+HoughCircles dan pencarian kontur pada resolusi penuh mahal untuk citra
+udara beresolusi tinggi. Mode ini:
+
+1. Menjalankan B1.detect pada citra yang diperkecil (scale), dengan
+   parameter jarak/radius/luas/kernel yang ikut diskalakan
+2. Memperhalus setiap kandidat pada resolusi penuh HANYA di ROI kecil di
+   sekitarnya: lingkaran dicari ulang dengan rentang radius
+   r/scale +- refine_window, persegi panjang dicari ulang dari edge ROI
+3. Mengklasifikasikan zona dari hasil resolusi penuh seperti B1 biasa
+
+Kandidat coarse yang tidak terkonfirmasi saat refinement dibuang.
+benchmark() melaporkan speedup dan kesesuaian hasil terhadap deteksi
+resolusi penuh. Catatan: radius HoughCircles resolusi penuh bergantung pada
+rentang radius yang dicari, sehingga untuk lingkaran yang lemah hasil
+refinement ROI bisa sedikit berbeda dari hasil deteksi penuh.
+"""
+
+
+import cv2
+import numpy as np
+
+import B1
+
+
+def scaled_params(params, scale):
+    """
+    Parameter B1 untuk tahap coarse pada citra yang diperkecil.
+
+    Jarak, radius dan luas diskalakan. Kernel blur sengaja TIDAK diperkecil:
+    smoothing yang relatif lebih kuat menekan tekstur yang di citra kecil
+    mudah terbaca sebagai lingkaran. Ambang akumulator Hough diturunkan
+    (jumlah vote sebanding keliling) agar tahap coarse mengutamakan recall;
+    kandidat palsu dibuang saat refinement.
+    """
+    small = B1.DetectionParams()
+    for name in B1.DetectionParams.__slots__:
+        setattr(small, name, getattr(params, name))
+    small.hough_param2 = params.hough_param2 * scale ** 0.5
+    small.hough_min_dist = params.hough_min_dist * scale
+    small.min_radius = max(int(params.min_radius * scale), 1)
+    small.max_radius = int(params.max_radius * scale)
+    small.min_contour_area = params.min_contour_area * scale * scale
+    return small
+
+
+def _crop(frame, x0, y0, x1, y1):
+    height, width = frame.shape[:2]
+    x0, y0 = max(int(x0), 0), max(int(y0), 0)
+    x1, y1 = min(int(x1), width), min(int(y1), height)
+    return frame[y0:y1, x0:x1], x0, y0
+
+
+def refine_circle(frame, circle, scale, params, refine_window):
+    """
+    Mencari ulang lingkaran di ROI resolusi penuh sekitar kandidat coarse;
+    None jika tidak ada lingkaran (kandidat coarse palsu)
+    """
+    cx, cy = circle.center[0] / scale, circle.center[1] / scale
+    radius = circle.radius / scale
+    # Toleransi = jendela refinement + kuantisasi grid coarse (1 piksel coarse)
+    tolerance = refine_window + 1 / scale
+    reach = radius + tolerance + params.circle_blur_ksize
+    roi, x0, y0 = _crop(frame, cx - reach, cy - reach, cx + reach + 1, cy + reach + 1)
+
+    blurred = B1.blur_for_circles(roi, params)
+    # Ambang penuh dulu; jika gagal, ambang tahap coarse (kandidat sudah
+    # mendapat vote di citra kecil, ROI sempit membatasi positif palsu)
+    for param2 in (params.hough_param2, params.hough_param2 * scale ** 0.5):
+        found = cv2.HoughCircles(
+            blurred, cv2.HOUGH_GRADIENT, dp=params.hough_dp, minDist=params.hough_min_dist,
+            param1=params.hough_param1, param2=param2,
+            minRadius=max(int(radius - tolerance), params.min_radius),
+            maxRadius=min(int(radius + tolerance + 1), params.max_radius)
+        )
+        if found is not None:
+            break
+    else:
+        return None
+
+    candidates = np.around(found[0, :]).astype(int)
+    distances = np.hypot(candidates[:, 0] + x0 - cx, candidates[:, 1] + y0 - cy)
+    best_x, best_y, best_r = candidates[int(np.argmin(distances))]
+    return B1.Circle((int(best_x) + x0, int(best_y) + y0), int(best_r))
+
+
+def refine_shape(frame, shape, scale, params, refine_window):
+    """
+    Mencari ulang bentuk di ROI resolusi penuh sekitar bounding box coarse;
+    None jika tidak ada kontur yang bertumpukan dengan kandidat
+    """
+    x, y, w, h = (v / scale for v in shape.bounding_box)
+    expected = (int(round(x)), int(round(y)), int(round(w)), int(round(h)))
+    pad = refine_window + params.channel_blur_ksize
+    roi, x0, y0 = _crop(frame, x - pad, y - pad, x + w + pad + 1, y + h + pad + 1)
+
+    best, best_iou = None, 0.0
+    for candidate in B1.find_shapes(B1.find_edges(roi, params), params):
+        cx, cy, cw, ch = candidate.bounding_box
+        bbox = (cx + x0, cy + y0, cw, ch)
+        overlap = B1.box_iou(bbox, expected)
+        if overlap > best_iou:
+            best_iou = overlap
+            best = B1.Shape(candidate.shape, bbox, (bbox[0] + cw // 2, bbox[1] + ch // 2))
+
+    return best
+
+
+def detect_pyramid(frame, params=None, scale=0.5, refine_window=8):
+    """
+    Deteksi coarse-to-fine; hasil sama bentuknya dengan B1.detect.
+    scale: faktor pengecilan tahap coarse, refine_window: toleransi (piksel
+    resolusi penuh) untuk radius dan tepi bounding box saat refinement
+    """
+    params = params or B1.DetectionParams()
+    small = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    coarse = B1.detect(small, scaled_params(params, scale))
+
+    circles = [refine_circle(frame, c, scale, params, refine_window) for c in coarse.circles]
+    shapes = [refine_shape(frame, s, scale, params, refine_window) for s in coarse.shapes]
+    circles = [c for c in circles if c is not None]
+    shapes = [s for s in shapes if s is not None]
+    return B1.Detections(circles, shapes, B1.classify_zones(shapes, circles))
+
+
+def agreement(reference, candidate, min_iou=0.75):
+    """
+    Fraksi zona yang cocok antara referensi dan kandidat: label sama dan
+    IoU bounding box >= min_iou (BUCKET memakai kotak dari pusat dan radius)
+    """
+    if not reference.zones:
+        return 1.0 if not candidate.zones else 0.0
+    matched = 0
+    remaining = list(candidate.zones)
+    for zone in reference.zones:
+        for other in remaining:
+            if other.label != zone.label:
+                continue
+            if B1.box_iou(zone.bounding_box, other.bounding_box) >= min_iou:
+                matched += 1
+                remaining.remove(other)
+                break
+    return matched / max(len(reference.zones), len(candidate.zones))
+
+
+def benchmark(frame, scale=0.5, refine_window=8, runs=5):
+    """Speedup dan kesesuaian mode piramida terhadap deteksi resolusi penuh"""
+    from benchmarks import median_ms
+
+    full_ms, reference = median_ms(lambda: B1.detect(frame), runs)
+    pyramid_ms, candidate = median_ms(lambda: detect_pyramid(frame, scale=scale,
+                                                             refine_window=refine_window), runs)
+    return {'resolution': f'{frame.shape[1]}x{frame.shape[0]}',
+            'scale': scale,
+            'full_ms': round(full_ms, 2),
+            'pyramid_ms': round(pyramid_ms, 2),
+            'speedup': round(full_ms / pyramid_ms, 2),
+            'zones_full': len(reference.zones),
+            'zones_pyramid': len(candidate.zones),
+            'agreement': round(agreement(reference, candidate), 3)}
+
+
+if __name__ == '__main__':
+    image = cv2.imread(B1.IMAGE_PATH)
+    for factor in (1, 2, 4):
+        frame = cv2.resize(image, None, fx=factor, fy=factor, interpolation=cv2.INTER_LINEAR)
+        for scale in (0.5, 0.25):
+            print(benchmark(frame, scale=scale))
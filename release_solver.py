@@ -0,0 +1,321 @@
+"""
+SOLVER TITIK RILIS DENGAN DRAG DAN ANGIN (LOOKUP TABLE)
+
+Gamaforce_C5 memakai parabola vakum (t = sqrt(2h/g), x = v*t) yang
+meleset pada ketinggian terbang kita. Modul ini:
+
+1. integrate_drop: integrator RK4 ter-batch (NumPy) untuk paket dengan
+   drag kuadratik dan angin konstan searah lintasan:
+       a = -k * |v_rel| * v_rel - g*z_hat,   v_rel = v_paket - angin
+   k = 0.5 * rho * Cd * A / m  (1/m). Semua titik diintegrasikan
+   bersamaan; saat menyentuh tanah waktu dan jarak diinterpolasi linear
+   di dalam langkah terakhir
+2. ReleaseTable: tabel waktu jatuh dan jarak horizontal atas grid
+   (kecepatan, ketinggian, angin); angin satu nilai -> tabel 2-D. Sumbu
+   ketinggian seragam dalam sqrt(h) karena waktu jatuh ~ sqrt(h): galat
+   interpolasi di ketinggian rendah jauh lebih kecil dengan jumlah titik
+   yang sama. Bisa disimpan / dimuat (.npz)
+3. query: interpolasi trilinear O(1) (indeks grid dihitung langsung, tanpa
+   pencarian) dalam Python murni agar cukup cepat dipanggil per sampel
+   telemetri; query_batch untuk array
+
+validate() membandingkan tabel dengan integrasi langsung pada titik acak.
+
+Contoh:
+    python release_solver.py --build tabel_rilis.npz --k-drag 0.004
+    python release_solver.py --load tabel_rilis.npz --validate 2000
+"""
+
+import argparse
+import math
+import time
+
+import numpy as np
+
+from Gamaforce_C5 import (STATUS_JATUHKAN, STATUS_TERLAMBAT, STATUS_TUNGGU,
+                          hitung_jarak_penjatuhan_kode)
+
+G = 9.8
+K_DRAG = 0.004  # 1/m; contoh paket ~1 kg, Cd ~1, A ~0.0065 m^2, rho 1.225
+
+
+def integrate_drop(speed, altitude, wind=0.0, k_drag=K_DRAG, g=G, dt=0.01, max_time=120.0):
+    """
+    Integrasi RK4 ter-batch; mengembalikan (waktu_jatuh, jarak_horizontal)
+    dalam bentuk hasil broadcast input. speed = kecepatan darat pesawat
+    (m/s), wind = angin searah lintasan (m/s, negatif = angin haluan).
+
+    Tanpa drag hasilnya sama dengan parabola vakum:
+
+    >>> t, x = integrate_drop(50.0, 500.0, k_drag=0.0)
+    >>> round(float(t), 3), round(float(x), 2)
+    (10.102, 505.08)
+    """
+    speed, altitude, wind = np.broadcast_arrays(*(np.asarray(a, dtype=np.float64)
+                                                  for a in (speed, altitude, wind)))
+    shape = speed.shape
+    vx = speed.ravel().copy()
+    w = wind.ravel()
+    z = altitude.ravel().copy()
+    x = np.zeros_like(vx)
+    vz = np.zeros_like(vx)
+    fall_time = np.full(vx.shape, np.nan)
+    travel = np.full(vx.shape, np.nan)
+
+    landed = z <= 0
+    fall_time[landed] = 0.0
+    travel[landed] = 0.0
+    active = np.flatnonzero(~landed)
+
+    def accel(vx, vz, w):
+        rx = vx - w
+        speed_rel = np.sqrt(rx * rx + vz * vz)
+        return -k_drag * speed_rel * rx, -k_drag * speed_rel * vz - g
+
+    t = 0.0
+    while active.size and t < max_time:
+        px, pz, pvx, pvz, pw = x[active], z[active], vx[active], vz[active], w[active]
+
+        ax1, az1 = accel(pvx, pvz, pw)
+        ax2, az2 = accel(pvx + 0.5 * dt * ax1, pvz + 0.5 * dt * az1, pw)
+        ax3, az3 = accel(pvx + 0.5 * dt * ax2, pvz + 0.5 * dt * az2, pw)
+        ax4, az4 = accel(pvx + dt * ax3, pvz + dt * az3, pw)
+
+        nx = px + dt / 6 * (pvx + 2 * (pvx + 0.5 * dt * ax1) + 2 * (pvx + 0.5 * dt * ax2)
+                            + (pvx + dt * ax3))
+        nz = pz + dt / 6 * (pvz + 2 * (pvz + 0.5 * dt * az1) + 2 * (pvz + 0.5 * dt * az2)
+                            + (pvz + dt * az3))
+        nvx = pvx + dt / 6 * (ax1 + 2 * ax2 + 2 * ax3 + ax4)
+        nvz = pvz + dt / 6 * (az1 + 2 * az2 + 2 * az3 + az4)
+        t += dt
+
+        hit = nz <= 0
+        if hit.any():
+            # Interpolasi linear titik sentuh tanah di dalam langkah terakhir
+            frac = pz[hit] / (pz[hit] - nz[hit])
+            idx = active[hit]
+            fall_time[idx] = t - dt + frac * dt
+            travel[idx] = px[hit] + frac * (nx[hit] - px[hit])
+
+        keep = ~hit
+        idx = active[keep]
+        x[idx], z[idx], vx[idx], vz[idx] = nx[keep], nz[keep], nvx[keep], nvz[keep]
+        active = idx
+
+    return fall_time.reshape(shape), travel.reshape(shape)
+
+
+def _axis(start, stop, count, sqrt_spacing=False):
+    if count == 1:
+        return np.array([float(start)])
+    if sqrt_spacing:
+        return np.linspace(math.sqrt(start), math.sqrt(stop), count) ** 2
+    return np.linspace(start, stop, count)
+
+
+class ReleaseTable:
+    """Tabel (kecepatan, ketinggian, angin) -> (waktu jatuh, jarak horizontal)"""
+
+    def __init__(self, speeds, altitudes, winds, fall_time, travel, k_drag=K_DRAG, g=G, dt=0.01):
+        self.speeds = np.asarray(speeds, dtype=np.float64)
+        self.altitudes = np.asarray(altitudes, dtype=np.float64)
+        self.winds = np.asarray(winds, dtype=np.float64)
+        self.fall_time = np.asarray(fall_time, dtype=np.float64)
+        self.travel = np.asarray(travel, dtype=np.float64)
+        self.k_drag, self.g, self.dt = float(k_drag), float(g), float(dt)
+
+        # Parameter grid seragam untuk query O(1): (awal, langkah, jumlah, stride);
+        # sumbu ketinggian dalam koordinat sqrt(h)
+        shape = self.fall_time.shape
+        strides = (shape[1] * shape[2], shape[2], 1)
+        self._axes = []
+        for values, stride in zip((self.speeds, np.sqrt(self.altitudes), self.winds), strides):
+            step = float(values[1] - values[0]) if len(values) > 1 else 1.0
+            self._axes.append((float(values[0]), step, len(values), stride))
+        self._time_flat = self.fall_time.ravel().tolist()
+        self._travel_flat = self.travel.ravel().tolist()
+
+    @classmethod
+    def build(cls, speed_range=(10.0, 120.0, 23), altitude_range=(20.0, 1500.0, 38),
+              wind_range=(-20.0, 20.0, 9), k_drag=K_DRAG, g=G, dt=0.01):
+        """Mengisi tabel dengan integrate_drop atas seluruh grid sekaligus"""
+        speeds = _axis(*speed_range)
+        altitudes = _axis(*altitude_range, sqrt_spacing=True)
+        winds = _axis(*wind_range)
+        v, h, w = np.meshgrid(speeds, altitudes, winds, indexing='ij')
+        fall_time, travel = integrate_drop(v, h, w, k_drag, g, dt)
+        return cls(speeds, altitudes, winds, fall_time, travel, k_drag, g, dt)
+
+    def save(self, path):
+        np.savez(path, speeds=self.speeds, altitudes=self.altitudes, winds=self.winds,
+                 fall_time=self.fall_time, travel=self.travel,
+                 params=np.array([self.k_drag, self.g, self.dt]))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            k_drag, g, dt = data['params'].tolist()
+            return cls(data['speeds'], data['altitudes'], data['winds'],
+                       data['fall_time'], data['travel'], k_drag, g, dt)
+
+    def query(self, speed, altitude, wind=0.0):
+        """
+        (waktu_jatuh, jarak_horizontal) untuk satu titik; interpolasi
+        trilinear, di luar grid nilai dijepit ke tepi tabel
+        """
+        base = 0
+        corners = []
+        root = math.sqrt(altitude) if altitude > 0 else 0.0
+        for value, (start, step, count, stride) in zip((speed, root, wind), self._axes):
+            f = (value - start) / step
+            if count == 1 or f <= 0:
+                i, frac = 0, 0.0
+            elif f >= count - 1:
+                i, frac = count - 2, 1.0
+            else:
+                i = int(f)
+                frac = f - i
+            base += i * stride
+            corners.append((frac, stride if count > 1 else 0))
+
+        (fv, sv), (fh, sh), (fw, sw) = corners
+        result = []
+        for flat in (self._time_flat, self._travel_flat):
+            c000 = flat[base]
+            c001 = flat[base + sw]
+            c010 = flat[base + sh]
+            c011 = flat[base + sh + sw]
+            c100 = flat[base + sv]
+            c101 = flat[base + sv + sw]
+            c110 = flat[base + sv + sh]
+            c111 = flat[base + sv + sh + sw]
+            c00 = c000 + (c001 - c000) * fw
+            c01 = c010 + (c011 - c010) * fw
+            c10 = c100 + (c101 - c100) * fw
+            c11 = c110 + (c111 - c110) * fw
+            c0 = c00 + (c01 - c00) * fh
+            c1 = c10 + (c11 - c10) * fh
+            result.append(c0 + (c1 - c0) * fv)
+        return result[0], result[1]
+
+    def query_batch(self, speed, altitude, wind=0.0):
+        """Versi array dari query (broadcast)"""
+        speed, altitude, wind = np.broadcast_arrays(*(np.asarray(a, dtype=np.float64)
+                                                      for a in (speed, altitude, wind)))
+        index = np.zeros(speed.shape, dtype=np.int64)
+        offsets, fracs = [], []
+        root = np.sqrt(np.maximum(altitude, 0))
+        for value, (start, step, count, stride) in zip((speed, root, wind), self._axes):
+            if count == 1:
+                i = np.zeros(value.shape, dtype=np.int64)
+                frac = np.zeros(value.shape)
+            else:
+                f = np.clip((value - start) / step, 0, count - 1)
+                i = np.minimum(f.astype(np.int64), count - 2)
+                frac = f - i
+            index += i * stride
+            offsets.append(stride if count > 1 else 0)
+            fracs.append(frac)
+
+        (sv, sh, sw), (fv, fh, fw) = offsets, fracs
+        results = []
+        for table in (self.fall_time.ravel(), self.travel.ravel()):
+            def at(offset):
+                return table[index + offset]
+            c00 = at(0) + (at(sw) - at(0)) * fw
+            c01 = at(sh) + (at(sh + sw) - at(sh)) * fw
+            c10 = at(sv) + (at(sv + sw) - at(sv)) * fw
+            c11 = at(sv + sh) + (at(sv + sh + sw) - at(sv + sh)) * fw
+            c0 = c00 + (c01 - c00) * fh
+            c1 = c10 + (c11 - c10) * fh
+            results.append(c0 + (c1 - c0) * fv)
+        return results[0], results[1]
+
+    def release(self, speed, altitude, posisi_pesawat_x, posisi_target_x, wind=0.0):
+        """
+        Sama seperti Gamaforce_C5.hitung_jarak_penjatuhan_kode tetapi dengan
+        drag dan angin: (jarak_drop, waktu_jatuh, jarak_horizontal_paket, kode)
+        """
+        fall_time, travel = self.query(speed, altitude, wind)
+        jarak_drop = (posisi_target_x - posisi_pesawat_x) - travel
+        if jarak_drop <= 0:
+            kode = STATUS_TERLAMBAT
+        elif jarak_drop < speed:  # Dalam 1 detik akan sampai
+            kode = STATUS_JATUHKAN
+        else:
+            kode = STATUS_TUNGGU
+        return jarak_drop, fall_time, travel, kode
+
+    def validate(self, samples=2000, seed=0):
+        """Galat tabel terhadap integrasi langsung pada titik acak di dalam grid"""
+        rng = np.random.default_rng(seed)
+        v = rng.uniform(self.speeds[0], self.speeds[-1], samples)
+        h = rng.uniform(self.altitudes[0], self.altitudes[-1], samples)
+        w = rng.uniform(self.winds[0], self.winds[-1], samples)
+        ref_time, ref_travel = integrate_drop(v, h, w, self.k_drag, self.g, self.dt)
+        time_est, travel_est = self.query_batch(v, h, w)
+        travel_err = np.abs(travel_est - ref_travel)
+        time_err = np.abs(time_est - ref_time)
+        return {'samples': samples,
+                'travel_max_m': round(float(travel_err.max()), 3),
+                'travel_mean_m': round(float(travel_err.mean()), 4),
+                'time_max_s': round(float(time_err.max()), 4),
+                'time_mean_s': round(float(time_err.mean()), 5)}
+
+
+def vacuum_error(table, samples=2000, seed=0):
+    """Seberapa jauh parabola vakum Gamaforce_C5 meleset dari model drag"""
+    rng = np.random.default_rng(seed)
+    errors = []
+    for _ in range(samples):
+        v = rng.uniform(table.speeds[0], table.speeds[-1])
+        h = rng.uniform(table.altitudes[0], table.altitudes[-1])
+        _, _, vacuum_travel, _ = hitung_jarak_penjatuhan_kode(v, h, 0.0, 0.0, table.g)
+        _, drag_travel = table.query(v, h, 0.0)
+        errors.append(abs(vacuum_travel - drag_travel))
+    return {'travel_max_m': round(max(errors), 2),
+            'travel_mean_m': round(sum(errors) / len(errors), 2)}
+
+
+def benchmark_query(table, runs=100000):
+    """Mikrodetik per query skalar (jalur telemetri)"""
+    rng = np.random.default_rng(1)
+    points = list(zip(rng.uniform(table.speeds[0], table.speeds[-1], runs).tolist(),
+                      rng.uniform(table.altitudes[0], table.altitudes[-1], runs).tolist(),
+                      rng.uniform(table.winds[0], table.winds[-1], runs).tolist()))
+    start = time.perf_counter()
+    for v, h, w in points:
+        table.query(v, h, w)
+    elapsed = time.perf_counter() - start
+    return {'queries': runs, 'us_per_query': round(1e6 * elapsed / runs, 2),
+            'queries_per_second': round(runs / elapsed)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solver titik rilis dengan drag dan angin")
+    parser.add_argument('--build', default=None, help="Bangun tabel lalu simpan ke .npz ini")
+    parser.add_argument('--load', default=None, help="Muat tabel .npz")
+    parser.add_argument('--k-drag', type=float, default=K_DRAG)
+    parser.add_argument('--dt', type=float, default=0.01)
+    parser.add_argument('--validate', type=int, default=2000,
+                        help="Jumlah titik acak untuk validasi (0 = lewati)")
+    args = parser.parse_args()
+
+    if args.load:
+        table = ReleaseTable.load(args.load)
+    else:
+        start = time.perf_counter()
+        table = ReleaseTable.build(k_drag=args.k_drag, dt=args.dt)
+        print(f"Tabel {table.fall_time.shape} dibangun dalam {time.perf_counter() - start:.2f} s")
+        if args.build:
+            table.save(args.build)
+            print(f"Tersimpan di {args.build}")
+
+    if args.validate:
+        print(f"Galat tabel vs integrasi langsung: {table.validate(args.validate)}")
+        print(f"Selisih parabola vakum vs model drag: {vacuum_error(table, args.validate)}")
+    print(f"Query: {benchmark_query(table)}")
+
+
+if __name__ == '__main__':
+    main()
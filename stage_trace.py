@@ -0,0 +1,256 @@
+"""
+TRACING PER TAHAP UNTUK PIPELINE VISION
+
+Lapisan instrumentasi ringan yang selalu tersedia:
+
+    with stage_trace.stage('B1.canny', ch.nbytes):
+        ...
+
+    @stage_trace.traced('image_filters.bilateral')
+    def apply_bilateral(image): ...
+
+- Nonaktif (default): stage() mengembalikan satu objek no-op bersama dan
+  traced() langsung memanggil fungsi aslinya; biayanya satu pemeriksaan
+  flag dan satu pemanggilan fungsi per tahap
+- Aktif (enable() atau environment LELA_TRACE=<berkas.json>): durasi
+  (perf_counter_ns) dan bytes yang diproses dicatat ke buffer milik
+  thread masing-masing (tanpa lock per event; lock hanya saat thread
+  pertama kali mendaftarkan buffernya). Buffer adalah ring
+  (deque maxlen=max_events, default MAX_EVENTS_PER_THREAD atau
+  LELA_TRACE_MAX_EVENTS): pada server yang berjalan lama hanya event
+  terbaru yang disimpan, memori tetap terbatas (~170 B per event)
+- export_chrome_trace() menulis JSON trace-event Chrome (ph "X"), bisa
+  dibuka di chrome://tracing atau https://ui.perfetto.dev; summary()
+  meringkas jumlah/total/rata-rata per tahap
+
+Dengan LELA_TRACE=<path>, trace otomatis ditulis saat interpreter keluar
+normal (atexit; termasuk Ctrl+C dan sys.exit, tidak untuk SIGKILL atau
+sinyal tanpa handler - server memasang handler SIGTERM sendiri).
+
+Contoh:
+    LELA_TRACE=trace.json python B1.py
+    python stage_trace.py --output trace.json
+"""
+
+import atexit
+import collections
+import functools
+import json
+import os
+import threading
+import time
+
+MAX_EVENTS_PER_THREAD = 200_000
+
+_enabled = False
+_max_events = int(os.environ.get('LELA_TRACE_MAX_EVENTS', MAX_EVENTS_PER_THREAD))
+_local = threading.local()
+_buffers = []          # (thread_id, nama_thread, deque event)
+_buffers_lock = threading.Lock()
+_perf_ns = time.perf_counter_ns
+
+
+class _NoopStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def add_bytes(self, nbytes):
+        pass
+
+
+_NOOP = _NoopStage()
+
+
+def _buffer():
+    try:
+        return _local.events
+    except AttributeError:
+        events = _local.events = collections.deque(maxlen=_max_events)
+        thread = threading.current_thread()
+        with _buffers_lock:
+            _buffers.append((thread.ident, thread.name, events))
+        return events
+
+
+class _Stage:
+    __slots__ = ('name', 'nbytes', 'start')
+
+    def __init__(self, name, nbytes):
+        self.name = name
+        self.nbytes = nbytes
+
+    def __enter__(self):
+        self.start = _perf_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = _perf_ns()
+        _buffer().append((self.name, self.start, end - self.start, self.nbytes))
+        return False
+
+    def add_bytes(self, nbytes):
+        self.nbytes += nbytes
+
+
+def stage(name, nbytes=0):
+    """Context manager satu tahap; no-op bersama jika tracing nonaktif"""
+    if not _enabled:
+        return _NOOP
+    return _Stage(name, nbytes)
+
+
+def _nbytes_of(args):
+    for arg in args:
+        nbytes = getattr(arg, 'nbytes', None)
+        if nbytes is not None:
+            return nbytes
+    return 0
+
+
+def traced(name=None):
+    """Decorator: seluruh pemanggilan fungsi dicatat sebagai satu tahap
+    (bytes = nbytes argumen array pertama)"""
+    def decorator(fn):
+        label = name or f'{fn.__module__}.{fn.__name__}'
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Stage(label, _nbytes_of(args)):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def enable(max_events=None):
+    """max_events: kapasitas ring per thread untuk buffer yang dibuat sesudahnya"""
+    global _enabled, _max_events
+    if max_events is not None:
+        _max_events = max_events
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    """Mengosongkan semua buffer (buffer tetap terdaftar di thread-nya)"""
+    with _buffers_lock:
+        for _, _, events in _buffers:
+            events.clear()
+
+
+def events():
+    """Salinan semua event: (thread_id, nama_thread, nama_tahap, start_ns, durasi_ns, bytes)"""
+    with _buffers_lock:
+        buffers = list(_buffers)
+    return [(tid, thread_name) + event
+            for tid, thread_name, buffer in buffers
+            for event in list(buffer)]
+
+
+def summary():
+    """{tahap: {count, total_ms, mean_ms, max_ms, bytes}} diurutkan total terbesar"""
+    stats = {}
+    for _, _, name, _, duration, nbytes in events():
+        entry = stats.setdefault(name, [0, 0, 0, 0])
+        entry[0] += 1
+        entry[1] += duration
+        entry[2] = max(entry[2], duration)
+        entry[3] += nbytes
+    ordered = sorted(stats.items(), key=lambda item: item[1][1], reverse=True)
+    return {name: {'count': count,
+                   'total_ms': round(total / 1e6, 3),
+                   'mean_ms': round(total / count / 1e6, 4),
+                   'max_ms': round(longest / 1e6, 4),
+                   'bytes': nbytes}
+            for name, (count, total, longest, nbytes) in ordered}
+
+
+def export_chrome_trace(path):
+    """Menulis JSON trace-event Chrome; mengembalikan jumlah event"""
+    recorded = events()
+    origin = min((event[3] for event in recorded), default=0)
+    pid = os.getpid()
+    trace = []
+    threads = {}
+    for tid, thread_name, name, start, duration, nbytes in recorded:
+        threads[tid] = thread_name
+        trace.append({'name': name, 'cat': name.split('.', 1)[0], 'ph': 'X',
+                      'ts': (start - origin) / 1000, 'dur': duration / 1000,
+                      'pid': pid, 'tid': tid, 'args': {'bytes': nbytes}})
+    for tid, thread_name in threads.items():
+        trace.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid,
+                      'args': {'name': thread_name}})
+    with open(path, 'w') as f:
+        json.dump({'traceEvents': trace, 'displayTimeUnit': 'ms'}, f)
+    return len(recorded)
+
+
+_trace_path = os.environ.get('LELA_TRACE')
+if _trace_path:
+    enable()
+    atexit.register(export_chrome_trace, _trace_path)
+
+
+def _demo(output, runs):
+    import cv2
+    import B1
+    import binary_mask
+    import image_filters
+    # Saat dijalankan sebagai script modul ini adalah __main__; flag dan
+    # buffer yang dipakai B1 dkk. ada di modul stage_trace yang diimpor
+    import stage_trace as trace
+
+    scene = cv2.imread(B1.IMAGE_PATH)
+    tulip = cv2.imread(image_filters.IMAGE_PATH)
+
+    def workload():
+        B1.detect(scene)
+        image_filters.apply_canny(tulip)
+        image_filters.apply_sobel(tulip)
+        image_filters.apply_bilateral(tulip)
+        binary_mask.create_binary_mask(scene, 60)
+
+    def timed():
+        start = time.perf_counter()
+        for _ in range(runs):
+            workload()
+        return (time.perf_counter() - start) / runs
+
+    workload()
+    trace.disable()
+    disabled = timed()
+    trace.enable()
+    trace.reset()
+    enabled_seconds = timed()
+    count = trace.export_chrome_trace(output)
+    trace.disable()
+
+    print(f"{count} event ditulis ke {output}")
+    for name, stats in trace.summary().items():
+        print(f"  {name:<32} n={stats['count']:<4} total {stats['total_ms']:>9.2f} ms  "
+              f"rata-rata {stats['mean_ms']:>8.3f} ms")
+    print(f"Satu putaran: nonaktif {1000 * disabled:.2f} ms, aktif {1000 * enabled_seconds:.2f} ms")
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Trace per tahap B1/image_filters/binary_mask")
+    parser.add_argument('--output', default='trace.json')
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+    _demo(args.output, args.runs)
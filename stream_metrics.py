@@ -0,0 +1,165 @@
+"""
+METRIK SERVER UNTUK LELA CAMERA STREAMING SERVER
+
+Counter, gauge dan histogram sederhana yang di-render dalam format teks
+Prometheus (text exposition format 0.0.4) untuk endpoint /metrics.
+Semua metrik aman dipakai dari banyak thread.
+"""
+
+import threading
+import time
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Bucket latensi dalam detik (0.5 ms sampai 1 s)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Nilai yang hanya bertambah"""
+
+    kind = 'counter'
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self._lock = threading.Lock()
+        self.value = 0
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def samples(self):
+        return [(self.name, '', self.value)]
+
+
+class Gauge:
+    """Nilai sesaat; bisa di-set langsung atau dibaca dari callback"""
+
+    kind = 'gauge'
+
+    def __init__(self, name, help_text, func=None):
+        self.name = name
+        self.help = help_text
+        self._func = func
+        self.value = 0
+
+    def set(self, value):
+        self.value = value
+
+    def samples(self):
+        return [(self.name, '', self._func() if self._func else self.value)]
+
+
+class Histogram:
+    """Histogram kumulatif dengan bucket tetap"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._counts = [0] * len(self.buckets)
+        self._sum = 0.0
+        self._count = 0
+
+    def observe(self, value):
+        with self._lock:
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self._counts[i] += 1
+                    break
+            self._sum += value
+            self._count += 1
+
+    def time(self):
+        """Context manager untuk mengukur durasi blok kode"""
+        return _Timer(self)
+
+    def samples(self):
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+        lines = []
+        cumulative = 0
+        for bound, n in zip(self.buckets, counts):
+            cumulative += n
+            lines.append((self.name + '_bucket', f'le="{_format_value(bound)}"', cumulative))
+        lines.append((self.name + '_bucket', 'le="+Inf"', count))
+        lines.append((self.name + '_sum', '', total))
+        lines.append((self.name + '_count', '', count))
+        return lines
+
+
+class _Timer:
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start)
+        return False
+
+
+class RateMeter:
+    """Laju per detik dari sebuah Counter, dihitung ulang paling cepat tiap window detik"""
+
+    def __init__(self, counter, window=1.0):
+        self.counter = counter
+        self.window = window
+        self._last_time = time.time()
+        self._last_value = counter.value
+        self._rate = 0.0
+
+    def rate(self):
+        now = time.time()
+        elapsed = now - self._last_time
+        if elapsed >= self.window:
+            value = self.counter.value
+            self._rate = (value - self._last_value) / elapsed
+            self._last_time, self._last_value = now, value
+        return self._rate
+
+
+class MetricsRegistry:
+    """Kumpulan metrik yang di-render bersama untuk /metrics"""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, help_text):
+        return self.register(Counter(name, help_text))
+
+    def gauge(self, name, help_text, func=None):
+        return self.register(Gauge(name, help_text, func))
+
+    def histogram(self, name, help_text, buckets=LATENCY_BUCKETS):
+        return self.register(Histogram(name, help_text, buckets))
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for name, labels, value in metric.samples():
+                label_text = '{' + labels + '}' if labels else ''
+                lines.append(f'{name}{label_text} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
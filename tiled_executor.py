@@ -0,0 +1,179 @@
+"""
+EKSEKUSI TILED MULTI-CORE UNTUK GAMBAR SANGAT BESAR (ORTHOMOSAIC)
+
+Gambar dibagi menjadi tile yang saling tumpang tindih: setiap tile dibaca
+bersama halo selebar radius kernel filter, difilter di thread pool (fungsi
+OpenCV melepas GIL), lalu hanya bagian intinya yang disalin ke array
+keluaran yang sudah dialokasikan (ndarray biasa atau memmap .npy di disk).
+
+- Hasil identik per piksel dengan pemanggilan tanpa tile: halo >= radius
+  kernel, dan di tepi gambar tile dipotong di batas gambar sehingga
+  penanganan border OpenCV sama dengan pada gambar utuh
+- Memori puncak terbatas: hanya `2 * workers` tile yang diproses
+  bersamaan, tidak bergantung ukuran gambar, asalkan input dan output
+  berupa memmap (.npy). Input PNG/JPEG tetap di-decode utuh oleh
+  cv2.imread; konversi sekali ke .npy dengan --to-npy
+- Hanya filter lokal yang bisa di-tile: bilateral dan threshold ya;
+  Sobel ternormalisasi (max global) dan Canny (hysteresis) tidak
+
+Contoh:
+    python tiled_executor.py mosaic.png --to-npy mosaic.npy
+    python tiled_executor.py mosaic.npy --filter bilateral --out bilateral.npy
+    python tiled_executor.py mosaic.npy --filter threshold --threshold 60 --out mask.npy
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import cv2
+import numpy as np
+
+import binary_mask
+import image_filters
+
+
+class TileFilter:
+    """Filter lokal: fn(tile) -> hasil, halo = radius kernel dalam piksel"""
+
+    __slots__ = ('name', 'fn', 'halo', 'channels')
+
+    def __init__(self, name, fn, halo, channels):
+        self.name = name
+        self.fn = fn
+        self.halo = halo
+        self.channels = channels  # None = keluaran 2D (satu channel)
+
+
+def bilateral_filter():
+    # apply_bilateral memakai d=9 -> radius 4
+    return TileFilter('bilateral', image_filters.apply_bilateral, halo=9 // 2, channels=3)
+
+
+def threshold_filter(threshold_value=127):
+    return TileFilter('threshold',
+                      lambda tile: binary_mask.create_binary_mask(tile, threshold_value),
+                      halo=0, channels=None)
+
+
+FILTERS = {
+    'bilateral': lambda args: bilateral_filter(),
+    'threshold': lambda args: threshold_filter(args.threshold),
+}
+
+
+def tile_grid(height, width, tile_size):
+    """Daftar inti tile (y0, y1, x0, x1) yang menutupi gambar tanpa tumpang tindih"""
+    return [(y, min(y + tile_size, height), x, min(x + tile_size, width))
+            for y in range(0, height, tile_size)
+            for x in range(0, width, tile_size)]
+
+
+def output_shape(image, tile_filter):
+    height, width = image.shape[:2]
+    return (height, width) if tile_filter.channels is None else (height, width, tile_filter.channels)
+
+
+def open_output(path, shape, dtype=np.uint8):
+    """Array keluaran memmap .npy di disk (ditulis per tile)"""
+    return np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=shape)
+
+
+def _process_tile(image, tile_filter, out, core):
+    y0, y1, x0, x1 = core
+    height, width = image.shape[:2]
+    halo = tile_filter.halo
+    hy0, hy1 = max(y0 - halo, 0), min(y1 + halo, height)
+    hx0, hx1 = max(x0 - halo, 0), min(x1 + halo, width)
+    # Salinan kontigu: dari memmap hanya halaman tile ini yang dibaca
+    tile = np.ascontiguousarray(image[hy0:hy1, hx0:hx1])
+    result = tile_filter.fn(tile)
+    out[y0:y1, x0:x1] = result[y0 - hy0:y1 - hy0, x0 - hx0:x1 - hx0]
+
+
+def run_tiled(image, tile_filter, out=None, tile_size=1024, workers=None):
+    """
+    Menjalankan tile_filter atas image (ndarray / memmap) per tile di thread
+    pool dan menulis ke out (dialokasikan jika None); mengembalikan out
+    """
+    if out is None:
+        out = np.empty(output_shape(image, tile_filter), np.uint8)
+    workers = workers or os.cpu_count() or 1
+    grid = iter(tile_grid(image.shape[0], image.shape[1], tile_size))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        running = set()
+        while True:
+            # Batasi tile yang sedang diproses agar memori puncak tetap terbatas
+            while len(running) < 2 * workers:
+                core = next(grid, None)
+                if core is None:
+                    break
+                running.add(pool.submit(_process_tile, image, tile_filter, out, core))
+            if not running:
+                break
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                future.result()
+    return out
+
+
+def open_image(path):
+    """.npy dibuka sebagai memmap (tanpa memuat ke RAM), format lain lewat cv2.imread"""
+    if path.lower().endswith('.npy'):
+        return np.load(path, mmap_mode='r')
+    image = cv2.imread(path)
+    if image is None:
+        raise FileNotFoundError(f"Gambar tidak ditemukan: {path}")
+    return image
+
+
+def verify(image, tile_filter, tiled):
+    """Jumlah piksel yang berbeda dari filter tanpa tile (butuh gambar utuh di RAM)"""
+    reference = tile_filter.fn(np.ascontiguousarray(image))
+    return int(np.count_nonzero(reference != tiled))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Filter tiled multi-core untuk gambar besar")
+    parser.add_argument('input', help="Gambar (.npy = memmap, atau format OpenCV)")
+    parser.add_argument('--filter', choices=sorted(FILTERS), default='bilateral')
+    parser.add_argument('--threshold', type=int, default=127)
+    parser.add_argument('--out', default=None, help="Keluaran .npy (memmap) atau gambar")
+    parser.add_argument('--tile', type=int, default=1024, help="Ukuran inti tile (piksel)")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--to-npy', default=None,
+                        help="Hanya konversi input ke .npy agar bisa dibuka sebagai memmap")
+    parser.add_argument('--verify', action='store_true',
+                        help="Bandingkan dengan filter tanpa tile (memuat gambar utuh)")
+    args = parser.parse_args()
+
+    image = open_image(args.input)
+    if args.to_npy:
+        np.save(args.to_npy, image)
+        print(f"Tersimpan {args.to_npy} ({image.shape[1]}x{image.shape[0]})")
+        return
+
+    tile_filter = FILTERS[args.filter](args)
+    shape = output_shape(image, tile_filter)
+    to_npy = args.out is not None and args.out.lower().endswith('.npy')
+    out = open_output(args.out, shape) if to_npy else None
+
+    start = time.perf_counter()
+    out = run_tiled(image, tile_filter, out, args.tile, args.workers)
+    elapsed = time.perf_counter() - start
+    megapixels = shape[0] * shape[1] / 1e6
+    print(f"{args.filter}: {shape[1]}x{shape[0]} dalam {elapsed:.2f} s "
+          f"({megapixels / elapsed:.1f} MP/detik)")
+
+    if to_npy:
+        out.flush()
+    elif args.out:
+        cv2.imwrite(args.out, out)
+    if args.verify:
+        print(f"Piksel berbeda dari hasil tanpa tile: {verify(image, tile_filter, out)}")
+
+
+if __name__ == '__main__':
+    main()
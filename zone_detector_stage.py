@@ -0,0 +1,123 @@
+"""
+TAHAP DETEKSI ZONA (DROPZONE/LANDZONE/BUCKET) UNTUK STREAM LELA
+
+Menjalankan deteksi dari B1.py di thread worker terpisah atas frame kamera
+TERBARU. Jika deteksi lebih lambat dari kamera, frame yang belum sempat
+diproses langsung diganti frame terbaru (dihitung sebagai frames_skipped),
+sehingga anotasi tidak pernah tertinggal makin jauh dari live.
+
+Hasil dipublikasikan dua arah:
+- frame ter-anotasi lewat read() (antarmuka sama dengan sumber frame),
+  sehingga bisa di-stream oleh FrameBroadcaster kedua
+- hasil deteksi terstruktur lewat latest_results() untuk endpoint JSON
+
+Throughput deteksi dihitung sendiri, terpisah dari FPS stream mentah.
+"""
+
+import threading
+import time
+
+from stream_metrics import Counter, RateMeter
+
+
+class DetectorStage:
+    """Worker deteksi yang selalu memproses frame terbaru"""
+
+    def __init__(self, detect_fn):
+        # detect_fn(frame) -> (frame_teranotasi, hasil_json_friendly)
+        self._detect_fn = detect_fn
+        self._cond = threading.Condition()
+        self._pending = None          # (frame, captured_at) belum diproses
+        self._annotated = None
+        self._annotated_id = 0
+        self._read_id = 0
+        self._results = None
+        self._thread = None
+        self._running = False
+        self.frames_submitted = 0
+        self.frames_skipped = 0
+        self.processed = Counter('lela_detections_total', 'Jumlah frame yang selesai dideteksi')
+        self.rate = RateMeter(self.processed)
+        self.last_detect_seconds = None
+
+    def start(self):
+        with self._cond:
+            if self._thread is None:
+                self._running = True
+                self._thread = threading.Thread(target=self._worker, daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def submit(self, frame, captured_at):
+        """Listener frame mentah; tidak pernah memblokir loop capture"""
+        with self._cond:
+            self.frames_submitted += 1
+            if self._pending is not None:
+                self.frames_skipped += 1
+            self._pending = (frame, captured_at)
+            self._cond.notify_all()
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while self._pending is None and self._running:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                frame, captured_at = self._pending
+                self._pending = None
+
+            start = time.perf_counter()
+            # Salin: frame dari sumber bisa read-only atau dipakai ulang
+            annotated, results = self._detect_fn(frame.copy())
+            self.last_detect_seconds = time.perf_counter() - start
+            self.processed.inc()
+
+            with self._cond:
+                self._annotated = annotated
+                self._annotated_id += 1
+                self._results = {
+                    'captured_at': captured_at,
+                    'detect_ms': round(1000 * self.last_detect_seconds, 2),
+                    'objects': results,
+                }
+                self._cond.notify_all()
+
+    def latest_results(self):
+        with self._cond:
+            return self._results
+
+    # Antarmuka sumber frame (read/isOpened/release) untuk FrameBroadcaster
+    def read(self):
+        # Satu pembaca (producer stream anotasi); menunggu frame yang belum dibaca
+        with self._cond:
+            while self._annotated_id == self._read_id and self._running:
+                self._cond.wait()
+            if not self._running:
+                return False, None
+            self._read_id = self._annotated_id
+            return True, self._annotated
+
+    def isOpened(self):
+        return self._running
+
+    def release(self):
+        self.stop()
+
+    def status(self):
+        return {
+            'running': self._running,
+            'detections_per_second': round(self.rate.rate(), 2),
+            'frames_processed': self.processed.value,
+            'frames_submitted': self.frames_submitted,
+            'frames_skipped': self.frames_skipped,
+            'last_detect_ms': (None if self.last_detect_seconds is None
+                               else round(1000 * self.last_detect_seconds, 2)),
+        }
@@ -0,0 +1,247 @@
+"""
+PELACAKAN ZONA ANTAR FRAME (DROPZONE/LANDZONE/BUCKET)
+
+Zona di darat hampir tidak bergerak antar frame berurutan, jadi deteksi B1
+penuh tidak perlu dijalankan ulang setiap frame. ZoneTracker:
+
+- Menjalankan deteksi penuh setiap `detect_every` frame, atau lebih cepat
+  jika kepercayaan pelacakan turun (terlalu sedikit titik yang berhasil
+  diikuti) atau belum ada track
+- Di antaranya memperbarui posisi setiap zona dengan optical flow
+  Lucas-Kanade atas titik fitur di dalam zona (pergeseran median)
+- Mencocokkan hasil deteksi penuh ke track yang ada (label sama, IoU
+  bounding box) sehingga setiap zona punya track_id tetap; posisi
+  dihaluskan (EMA) dan track yang sesaat tidak terdeteksi tetap
+  dipertahankan beberapa deteksi (max_misses) agar hasil tidak berkedip
+"""
+
+import time
+
+import cv2
+import numpy as np
+
+import B1
+
+
+class Track:
+    """Satu zona yang dilacak; bounding box disimpan float (x, y, w, h)"""
+
+    __slots__ = ('track_id', 'label', 'box', 'radius', 'hits', 'misses', 'points',
+                 'confidence')
+
+    def __init__(self, track_id, zone):
+        self.track_id = track_id
+        self.label = zone.label
+        self.box = np.array(zone.bounding_box, dtype=np.float64)
+        self.radius = zone.radius
+        self.hits = 1
+        self.misses = 0
+        self.points = None
+        self.confidence = 1.0
+
+    @property
+    def center(self):
+        x, y, w, h = self.box
+        return (int(round(x + w / 2)), int(round(y + h / 2)))
+
+    @property
+    def bounding_box(self):
+        return tuple(int(round(v)) for v in self.box)
+
+    def zone(self):
+        """Zone B1 dari posisi track saat ini (untuk draw_detections)"""
+        radius = None if self.radius is None else int(round(self.box[2] / 2))
+        return B1.Zone(self.label, self.bounding_box, self.center, radius)
+
+    def to_dict(self):
+        result = self.zone().to_dict()
+        result['track_id'] = self.track_id
+        result['confidence'] = round(self.confidence, 3)
+        return result
+
+
+class ZoneTracker:
+    def __init__(self, detect_fn=None, detect_every=10, min_confidence=0.5, min_points=4,
+                 max_misses=2, match_iou=0.3, smoothing=0.5, max_corners=30):
+        # detect_fn(frame) -> B1.Detections; default B1.detect
+        self.detect_fn = detect_fn or B1.detect
+        self.detect_every = detect_every
+        self.min_confidence = min_confidence
+        self.min_points = min_points
+        self.max_misses = max_misses
+        self.match_iou = match_iou
+        self.smoothing = smoothing
+        self.max_corners = max_corners
+        self.tracks = []
+        self._next_id = 1
+        self._prev_gray = None
+        self._since_detect = 0
+        self._force_detect = True
+        self.frames = 0
+        self.full_detections = 0
+        self.flow_updates = 0
+
+    def update(self, frame):
+        """Memproses satu frame BGR; mengembalikan daftar Track aktif"""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        self.frames += 1
+        if (self._force_detect or not self.tracks or self._prev_gray is None
+                or self._since_detect >= self.detect_every):
+            self._detect(frame, gray)
+        else:
+            self._flow(gray)
+        self._prev_gray = gray
+        return self.tracks
+
+    def _detect(self, frame, gray):
+        detections = self.detect_fn(frame)
+        self.full_detections += 1
+        self._since_detect = 1
+        self._force_detect = False
+
+        # Pencocokan greedy: pasangan (IoU tertinggi dulu) dengan label sama
+        pairs = []
+        for ti, track in enumerate(self.tracks):
+            for zi, zone in enumerate(detections.zones):
+                if zone.label == track.label:
+                    overlap = B1.box_iou(track.box, zone.bounding_box)
+                    if overlap >= self.match_iou:
+                        pairs.append((overlap, ti, zi))
+        pairs.sort(reverse=True)
+
+        matched_tracks, matched_zones = set(), set()
+        alpha = self.smoothing
+        for _, ti, zi in pairs:
+            if ti in matched_tracks or zi in matched_zones:
+                continue
+            matched_tracks.add(ti)
+            matched_zones.add(zi)
+            track = self.tracks[ti]
+            track.box = alpha * track.box + (1 - alpha) * np.array(
+                detections.zones[zi].bounding_box, dtype=np.float64)
+            track.hits += 1
+            track.misses = 0
+
+        survivors = []
+        for ti, track in enumerate(self.tracks):
+            if ti not in matched_tracks:
+                track.misses += 1
+                if track.misses > self.max_misses:
+                    continue
+            survivors.append(track)
+        for zi, zone in enumerate(detections.zones):
+            if zi not in matched_zones:
+                survivors.append(Track(self._next_id, zone))
+                self._next_id += 1
+        self.tracks = survivors
+
+        for track in self.tracks:
+            self._seed_points(gray, track)
+
+    def _seed_points(self, gray, track):
+        """Titik fitur (goodFeaturesToTrack) di dalam zona untuk optical flow"""
+        x, y, w, h = track.bounding_box
+        mask = np.zeros_like(gray)
+        if track.radius is not None:
+            cv2.circle(mask, track.center, max(w // 2, 1), 255, -1)
+        else:
+            cv2.rectangle(mask, (x, y), (x + w, y + h), 255, -1)
+        track.points = cv2.goodFeaturesToTrack(gray, self.max_corners, 0.01, 5, mask=mask)
+        track.confidence = 1.0
+
+    def _flow(self, gray):
+        self._since_detect += 1
+        self.flow_updates += 1
+        seeded = [t for t in self.tracks if t.points is not None and len(t.points)]
+        if len(seeded) < len(self.tracks):
+            # Zona tanpa tekstur tidak bisa diikuti; deteksi ulang frame berikutnya
+            self._force_detect = True
+        if not seeded:
+            return
+
+        points = np.concatenate([t.points for t in seeded])
+        moved, status, _ = cv2.calcOpticalFlowPyrLK(self._prev_gray, gray, points, None,
+                                                    winSize=(21, 21), maxLevel=2)
+        status = status.reshape(-1).astype(bool)
+
+        start = 0
+        for track in seeded:
+            count = len(track.points)
+            ok = status[start:start + count]
+            old = track.points[ok].reshape(-1, 2)
+            new = moved[start:start + count][ok].reshape(-1, 2)
+            start += count
+
+            track.confidence = float(ok.mean()) if count else 0.0
+            if len(new) < self.min_points or track.confidence < self.min_confidence:
+                self._force_detect = True
+                continue
+            dx, dy = np.median(new - old, axis=0)
+            track.box[0] += dx
+            track.box[1] += dy
+            track.points = new.reshape(-1, 1, 2)
+
+    def detections(self):
+        """Track aktif sebagai B1.Detections (lingkaran BUCKET ikut digambar)"""
+        zones = [t.zone() for t in self.tracks]
+        circles = [B1.Circle(z.center, z.radius) for z in zones if z.radius is not None]
+        return B1.Detections(circles, [], zones)
+
+    def draw(self, img):
+        """Menggambar zona terlacak beserta track_id di atas img (in-place)"""
+        B1.draw_detections(img, self.detections())
+        for track in self.tracks:
+            x, y, w, h = track.bounding_box
+            cv2.putText(img, f"#{track.track_id}", (x, y + h + 22), cv2.FONT_HERSHEY_SIMPLEX,
+                        0.7, (255, 255, 0), 2)
+        return img
+
+    def status(self):
+        return {
+            'tracks': len(self.tracks),
+            'frames': self.frames,
+            'full_detections': self.full_detections,
+            'flow_updates': self.flow_updates,
+            'detect_every': self.detect_every,
+        }
+
+
+def shifted_sequence(image, frames=60, step=(1.5, 0.75)):
+    """Frame uji: citra contoh yang bergeser perlahan (simulasi kamera bergerak)"""
+    height, width = image.shape[:2]
+    sequence = []
+    for i in range(frames):
+        matrix = np.float32([[1, 0, step[0] * i], [0, 1, step[1] * i]])
+        sequence.append(cv2.warpAffine(image, matrix, (width, height),
+                                       borderMode=cv2.BORDER_REFLECT))
+    return sequence
+
+
+def benchmark(frames, detect_every=10):
+    """Biaya rata-rata per frame dan kedipan: deteksi tiap frame vs tracker"""
+    def flicker(counts):
+        return sum(1 for a, b in zip(counts, counts[1:]) if a != b)
+
+    start = time.perf_counter()
+    full_counts = [len(B1.detect(frame).zones) for frame in frames]
+    full_ms = 1000 * (time.perf_counter() - start) / len(frames)
+
+    tracker = ZoneTracker(detect_every=detect_every)
+    start = time.perf_counter()
+    tracked_counts = [len(tracker.update(frame)) for frame in frames]
+    tracked_ms = 1000 * (time.perf_counter() - start) / len(frames)
+
+    return {'frames': len(frames),
+            'full_ms_per_frame': round(full_ms, 2),
+            'tracked_ms_per_frame': round(tracked_ms, 2),
+            'speedup': round(full_ms / tracked_ms, 2),
+            'full_count_changes': flicker(full_counts),
+            'tracked_count_changes': flicker(tracked_counts),
+            'track_ids': sorted({t.track_id for t in tracker.tracks}),
+            **tracker.status()}
+
+
+if __name__ == '__main__':
+    sequence = shifted_sequence(cv2.imread(B1.IMAGE_PATH))
+    for every in (5, 10, 20):
+        print(benchmark(sequence, detect_every=every))